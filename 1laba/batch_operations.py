@@ -0,0 +1,218 @@
+import numpy as np
+
+from ieee754 import FORMATS, GUARD_BITS, ROUNDING_MODES
+
+# precision: (беззнаковый тип кода, тип числа)
+FLOAT_DTYPES = {
+    'half': (np.uint16, np.float16),
+    'single': (np.uint32, np.float32),
+    'double': (np.uint64, np.float64),
+}
+
+
+def _bit_length(values):
+    """Векторный аналог int.bit_length для неотрицательных int64"""
+    length = np.zeros_like(values)
+    for step in (32, 16, 8, 4, 2, 1):
+        wide = (values >> step) != 0
+        length += np.where(wide, step, 0)
+        values = np.where(wide, values >> step, values)
+    return length + (values != 0)
+
+
+class BatchNumberOperations:
+    """Векторные аналоги методов NumberOperations для массивов чисел.
+
+    Каждый метод принимает массив NumPy (или любую последовательность целых)
+    и обрабатывает все элементы за один проход без циклов Python.
+    Формат результата задаётся параметром output:
+        'str'   - массив строк '0'/'1', как у скалярных методов;
+        'bytes' - массив байтовых строк (dtype S32);
+        'bits'  - двумерный массив uint8 формы (N, 32);
+        'words' - массив uint32 с упакованными кодами.
+    """
+
+    OUTPUTS = ('str', 'bytes', 'bits', 'words')
+
+    def __init__(self):
+        self.TOTAL_BITS = 32
+        self.MAX_BITS = 31
+        self.MAX_VALUE = (1 << self.MAX_BITS) - 1
+        self.MIN_VALUE = -(1 << self.MAX_BITS)
+
+    def _as_array(self, values, min_value):
+        arr = np.asarray(values).ravel()
+        if arr.dtype.kind == 'O':
+            # Целые Python за пределами int64 NumPy хранит объектами
+            if not all(isinstance(v, (int, np.integer)) for v in arr):
+                raise ValueError("Ожидаются целые числа")
+        elif arr.size and arr.dtype.kind not in 'iub':
+            # Дробные числа не обрезаются молча: скалярные методы их тоже не принимают
+            raise ValueError("Ожидаются целые числа")
+        # Диапазон проверяется до приведения к int64, которое переполнилось бы
+        if arr.size and (arr.min() < min_value or arr.max() > self.MAX_VALUE):
+            raise ValueError(f"Числа должны быть в диапазоне [{min_value}, {self.MAX_VALUE}]")
+        return arr.astype(np.int64)
+
+    def _render(self, words, output):
+        if output not in self.OUTPUTS:
+            raise ValueError(f"Неизвестный формат результата: {output}")
+        if output == 'words':
+            return words
+        width = words.dtype.itemsize * 8
+        # Старший байт первым, чтобы знаковый бит оказался в столбце 0
+        octets = words.astype(words.dtype.newbyteorder('>')).view(np.uint8)
+        bits = np.unpackbits(octets.reshape(-1, words.dtype.itemsize), axis=1)
+        if output == 'bits':
+            return bits
+        chars = np.ascontiguousarray(bits + ord('0'))
+        codes = chars.view(f'S{width}').ravel()
+        return codes if output == 'bytes' else codes.astype(f'U{width}')
+
+    def _parse(self, codes, dtype):
+        """Массив кодов (целых или строк '0'/'1') -> массив беззнаковых слов"""
+        arr = np.asarray(codes)
+        width = np.dtype(dtype).itemsize * 8
+        if arr.dtype.kind not in 'US':
+            return arr.astype(dtype, copy=False).ravel()
+        # Длина проверяется до приведения к S{width}, которое молча обрезает длинные строки
+        lengths = np.char.str_len(arr).ravel()
+        if lengths.size and (lengths.min() != width or lengths.max() != width):
+            raise ValueError(f"Ожидаются строки из {width} бит")
+        chars = arr.astype(f'S{width}').ravel()
+        bits = chars.view(np.uint8).reshape(-1, width) - ord('0')
+        # packbits считает единицей любой ненулевой байт, поэтому символы проверяются явно
+        if not np.all((bits == 0) | (bits == 1)):
+            raise ValueError("Строки кода должны состоять из '0' и '1'")
+        octets = np.packbits(bits, axis=1)
+        return octets.view(np.dtype(dtype).newbyteorder('>')).ravel().astype(dtype)
+
+    def to_direct_code(self, values, output='str'):
+        arr = self._as_array(values, -self.MAX_VALUE)
+        sign = (arr < 0).astype(np.int64) << self.MAX_BITS
+        words = (np.abs(arr) | sign).astype(np.uint32)
+        return self._render(words, output)
+
+    def to_inverse_code(self, values, output='str'):
+        arr = self._as_array(values, -self.MAX_VALUE)
+        # У отрицательных чисел инвертируются все разряды модуля, знак остаётся 1
+        inverted = np.where(arr < 0, arr - 1, arr)
+        words = (inverted & 0xFFFFFFFF).astype(np.uint32)
+        return self._render(words, output)
+
+    def to_complement_code(self, values, output='str'):
+        # В дополнительном коде представимо и -2^31, в отличие от прямого и обратного
+        arr = self._as_array(values, self.MIN_VALUE)
+        words = (arr & 0xFFFFFFFF).astype(np.uint32)
+        return self._render(words, output)
+
+    def binary_to_decimal(self, codes):
+        """Коды дополнительного кода (слова или строки) -> массив int64"""
+        return self._parse(codes, np.uint32).view(np.int32).astype(np.int64)
+
+    def float_to_ieee754(self, values, precision='single', output='str'):
+        """Числа -> коды IEEE-754 с округлением к ближайшему чётному"""
+        if precision not in FLOAT_DTYPES:
+            raise ValueError(f"Неизвестная точность: {precision}")
+        word_type, float_type = FLOAT_DTYPES[precision]
+        arr = np.asarray(values, dtype=np.float64).ravel()
+        # Приведение типа NumPy округляет к чётному и даёт inf при переполнении
+        with np.errstate(over='ignore'):
+            floats = arr.astype(float_type)
+        return self._render(floats.view(word_type), output)
+
+    def ieee754_to_float(self, codes, precision='single'):
+        """Коды IEEE-754 (слова или строки) -> массив чисел той же точности"""
+        if precision not in FLOAT_DTYPES:
+            raise ValueError(f"Неизвестная точность: {precision}")
+        word_type, float_type = FLOAT_DTYPES[precision]
+        return self._parse(codes, word_type).view(float_type)
+
+    def add_floating_point(self, a_codes, b_codes, precision='single', rounding='nearest_even'):
+        """Поэлементное сложение кодов IEEE-754, повторяющее IEEE754Codec.add.
+
+        Возвращает массив беззнаковых слов той же точности.
+        """
+        if precision not in FLOAT_DTYPES:
+            raise ValueError(f"Неизвестная точность: {precision}")
+        if rounding not in ROUNDING_MODES:
+            raise ValueError(f"Неизвестный режим округления: {rounding}")
+        word_type, _ = FLOAT_DTYPES[precision]
+        total_bits, exponent_bits, mantissa_bits = FORMATS[precision][:3]
+        a, b = np.broadcast_arrays(self._parse(a_codes, word_type), self._parse(b_codes, word_type))
+        top = (1 << exponent_bits) - 1
+        mantissa_mask = (1 << mantissa_bits) - 1
+        hidden = 1 << mantissa_bits
+
+        def fields(words):
+            return ((words >> (total_bits - 1)).astype(np.int64),
+                    ((words >> mantissa_bits) & top).astype(np.int64),
+                    (words & mantissa_mask).astype(np.int64))
+
+        def pack(sign, exponent, mantissa):
+            words = sign.astype(word_type) << (total_bits - 1)
+            return words | (exponent.astype(word_type) << mantissa_bits) | mantissa.astype(word_type)
+
+        sa, ea0, ma0 = fields(a)
+        sb, eb0, mb0 = fields(b)
+        ma = np.where(ea0 > 0, ma0 | hidden, ma0) << GUARD_BITS
+        mb = np.where(eb0 > 0, mb0 | hidden, mb0) << GUARD_BITS
+        ea, eb = np.maximum(ea0, 1), np.maximum(eb0, 1)
+        swap = (ea < eb) | ((ea == eb) & (ma < mb))
+        sa, sb = np.where(swap, sb, sa), np.where(swap, sa, sb)
+        ea, eb = np.where(swap, eb, ea), np.where(swap, ea, eb)
+        ma, mb = np.where(swap, mb, ma), np.where(swap, ma, mb)
+
+        # Сдвиг больше ширины мантиссы целиком уходит в липкий бит
+        width = mantissa_bits + GUARD_BITS + 1
+        shift = np.minimum(ea - eb, width + 1)
+        sticky = (mb & ((np.int64(1) << shift) - 1)) != 0
+        mb = (mb >> shift) | sticky
+        m = np.where(sa == sb, ma + mb, ma - mb)
+        zero = m == 0
+
+        carry = (m >> width) != 0
+        m = np.where(carry, (m >> 1) | (m & 1), m)
+        e = ea + carry
+        shift = np.minimum(np.maximum(width - _bit_length(m), 0), e - 1)
+        m <<= shift
+        e -= shift
+
+        rest = m & ((1 << GUARD_BITS) - 1)
+        m >>= GUARD_BITS
+        half = 1 << (GUARD_BITS - 1)
+        if rounding == 'nearest_even':
+            round_up = (rest > half) | ((rest == half) & ((m & 1) == 1))
+        elif rounding == 'toward_zero':
+            round_up = np.zeros_like(zero)
+        else:
+            round_up = (rest != 0) & (sa == int(rounding == 'down'))
+        m = m + round_up
+        carry = (m >> (mantissa_bits + 1)) != 0
+        m = np.where(carry, m >> 1, m)
+        e = np.where((m >> mantissa_bits) != 0, e + carry, 0)
+        result = pack(sa, np.minimum(e, top), m & mantissa_mask)
+
+        infinity = pack(sa, np.full_like(e, top), np.zeros_like(m))
+        if rounding == 'nearest_even':
+            to_infinity = np.ones_like(zero)
+        elif rounding == 'toward_zero':
+            to_infinity = np.zeros_like(zero)
+        else:
+            to_infinity = sa == int(rounding == 'down')
+        max_finite = pack(sa, np.full_like(e, top - 1), np.full_like(m, mantissa_mask))
+        result = np.where(e >= top, np.where(to_infinity, infinity, max_finite), result)
+
+        zero_sign = np.where(sa == sb, sa, int(rounding == 'down'))
+        result = np.where(zero, pack(zero_sign, np.zeros_like(e), np.zeros_like(m)), result)
+
+        # Особые значения: NaN поглощает всё, inf + (-inf) даёт NaN
+        quiet = word_type(1 << (mantissa_bits - 1))
+        a_special, b_special = ea0 == top, eb0 == top
+        a_nan, b_nan = a_special & (ma0 != 0), b_special & (mb0 != 0)
+        default_nan = word_type((top << mantissa_bits) | (1 << (mantissa_bits - 1)))
+        a_sign, b_sign = a >> (total_bits - 1), b >> (total_bits - 1)
+        result = np.where(b_special, b, result)
+        result = np.where(a_special, np.where(b_special & (a_sign != b_sign), default_nan, a), result)
+        result = np.where(b_nan, b | quiet, result)
+        return np.where(a_nan, a | quiet, result)
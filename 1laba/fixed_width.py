@@ -0,0 +1,145 @@
+# Цифры радикс-4 алгоритма Бута по тройке битов множителя (b[i+1], b[i], b[i-1])
+BOOTH_DIGITS = (0, 1, 1, 2, -2, -1, -1, 0)
+
+
+class TwosComplement:
+    """Арифметика в дополнительном коде произвольной разрядности.
+
+    Значения хранятся как неотрицательные целые Python в пределах маски
+    (сырые коды), все операции выполняются битовыми операциями над целыми.
+    Строки '0'/'1' строятся только методами to_*_code и to_string.
+    """
+
+    def __init__(self, bits=32):
+        if bits < 2:
+            raise ValueError("Разрядность должна быть не меньше 2")
+        self.bits = bits
+        self.mask = (1 << bits) - 1
+        self.sign_bit = 1 << (bits - 1)
+        self.max_value = self.sign_bit - 1
+        self.min_value = -self.sign_bit
+
+    def _check_range(self, n, min_value):
+        if not min_value <= n <= self.max_value:
+            raise ValueError(f"Число {n} не помещается в {self.bits} бит")
+
+    def encode(self, n):
+        """Знаковое целое -> сырой код в дополнительном коде"""
+        self._check_range(n, self.min_value)
+        return n & self.mask
+
+    def decode(self, raw):
+        """Сырой код -> знаковое целое"""
+        raw &= self.mask
+        return raw - (1 << self.bits) if raw & self.sign_bit else raw
+
+    def add(self, a, b):
+        """Сложение сырых кодов. Возвращает (результат, перенос, переполнение)"""
+        total = a + b
+        result = total & self.mask
+        overflow = bool(~(a ^ b) & (a ^ result) & self.sign_bit)
+        return result, total >> self.bits, overflow
+
+    def subtract(self, a, b):
+        """Вычитание a - b как a + ~b + 1. Перенос 1 означает отсутствие заёма"""
+        total = a + (b ^ self.mask) + 1
+        result = total & self.mask
+        overflow = bool((a ^ b) & (a ^ result) & self.sign_bit)
+        return result, total >> self.bits, overflow
+
+    def negate(self, a):
+        """Смена знака. Возвращает (результат, переполнение)"""
+        return -a & self.mask, a == self.sign_bit
+
+    def to_string(self, raw):
+        return format(raw & self.mask, f'0{self.bits}b')
+
+    def to_direct_code(self, n):
+        self._check_range(n, -self.max_value)
+        raw = -n | self.sign_bit if n < 0 else n
+        return self.to_string(raw)
+
+    def to_inverse_code(self, n):
+        self._check_range(n, -self.max_value)
+        return self.to_string(n - 1 if n < 0 else n)
+
+    def to_complement_code(self, n):
+        return self.to_string(self.encode(n))
+
+    def multiply(self, a, b):
+        """Умножение сырых кодов по Буту (радикс 4).
+
+        Возвращает точное знаковое произведение, оно всегда помещается
+        в удвоенную разрядность. Те же шаги с трассой даёт multiply_steps;
+        здесь цикл без генератора и кортежей на каждом шаге.
+        """
+        multiplicand = self.decode(a)
+        # Сдвиг добавляет неявный нулевой бит b[-1]
+        multiplier = self.decode(b) << 1
+        product = 0
+        for i in range(0, self.bits, 2):
+            product += (BOOTH_DIGITS[(multiplier >> i) & 7] * multiplicand) << i
+        return product
+
+    def multiply_steps(self, a, b):
+        """Пошаговая трасса умножения: (позиция, цифра Бута, частичное произведение, сумма)"""
+        multiplicand = self.decode(a)
+        # Сдвиг добавляет неявный нулевой бит b[-1]
+        multiplier = self.decode(b) << 1
+        product = 0
+        for i in range(0, self.bits, 2):
+            digit = BOOTH_DIGITS[(multiplier >> i) & 7]
+            partial = (digit * multiplicand) << i
+            product += partial
+            yield i, digit, partial, product
+
+    def divide_unsigned(self, dividend, divisor):
+        """Деление без восстановления остатка для неотрицательных целых любой длины.
+
+        Возвращает (частное, остаток). В конце отрицательный остаток
+        восстанавливается один раз. Трассу тех же шагов даёт divide_steps.
+        """
+        if divisor == 0:
+            raise ZeroDivisionError("Деление на ноль!")
+        quotient = 0
+        remainder = 0
+        for i in range(dividend.bit_length() - 1, -1, -1):
+            bit = (dividend >> i) & 1
+            # При отрицательном остатке вместо восстановления делитель прибавляется на следующем шаге
+            if remainder >= 0:
+                remainder = 2 * remainder + bit - divisor
+            else:
+                remainder = 2 * remainder + bit + divisor
+            quotient = (quotient << 1) | (remainder >= 0)
+        if remainder < 0:
+            remainder += divisor
+        return quotient, remainder
+
+    def divide_steps(self, dividend, divisor):
+        """Пошаговая трасса деления без восстановления: (разряд, частичный остаток, частное)"""
+        if divisor == 0:
+            raise ZeroDivisionError("Деление на ноль!")
+        quotient = 0
+        remainder = 0
+        for i in range(dividend.bit_length() - 1, -1, -1):
+            bit = (dividend >> i) & 1
+            # При отрицательном остатке вместо восстановления делитель прибавляется на следующем шаге
+            if remainder >= 0:
+                remainder = 2 * remainder + bit - divisor
+            else:
+                remainder = 2 * remainder + bit + divisor
+            quotient = (quotient << 1) | (remainder >= 0)
+            yield i, remainder, quotient
+
+    def divide(self, a, b):
+        """Знаковое деление сырых кодов с усечением к нулю.
+
+        Возвращает (частное, остаток, переполнение); остаток имеет знак делимого.
+        """
+        dividend, divisor = self.decode(a), self.decode(b)
+        quotient, remainder = self.divide_unsigned(abs(dividend), abs(divisor))
+        if (dividend < 0) != (divisor < 0):
+            quotient = -quotient
+        if dividend < 0:
+            remainder = -remainder
+        return quotient & self.mask, remainder & self.mask, quotient > self.max_value
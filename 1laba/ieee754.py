@@ -0,0 +1,162 @@
+import math
+import struct
+
+# precision: (всего бит, бит порядка, бит мантиссы, формат float, формат int для struct)
+FORMATS = {
+    'half': (16, 5, 10, 'e', 'H'),
+    'single': (32, 8, 23, 'f', 'I'),
+    'double': (64, 11, 52, 'd', 'Q'),
+}
+
+ROUNDING_MODES = ('nearest_even', 'toward_zero', 'up', 'down')
+
+# Защитный, округляющий и липкий биты справа от мантиссы
+GUARD_BITS = 3
+
+
+class IEEE754Codec:
+    """Кодирование чисел в форматы IEEE-754 binary16/binary32/binary64.
+
+    Упаковка делегируется struct, который округляет к ближайшему чётному и
+    корректно обрабатывает денормализованные числа, бесконечности и NaN.
+    Переполнение при округлении даёт бесконечность со знаком числа.
+    """
+
+    def __init__(self, precision='single'):
+        if precision not in FORMATS:
+            raise ValueError(f"Неизвестная точность: {precision}")
+        self.precision = precision
+        self.total_bits, self.exponent_bits, self.mantissa_bits, float_code, int_code = FORMATS[precision]
+        self.bias = (1 << (self.exponent_bits - 1)) - 1
+        self.mask = (1 << self.total_bits) - 1
+        self.exponent_mask = (1 << self.exponent_bits) - 1
+        self.mantissa_mask = (1 << self.mantissa_bits) - 1
+        self.sign_bit = 1 << (self.total_bits - 1)
+        self._float = struct.Struct('>' + float_code)
+        self._int = struct.Struct('>' + int_code)
+
+    def infinity(self, sign=0):
+        return (sign << (self.total_bits - 1)) | (self.exponent_mask << self.mantissa_bits)
+
+    def encode(self, num):
+        """Число -> упакованный код (целое)"""
+        try:
+            packed = self._float.pack(num)
+        except OverflowError:
+            return self.infinity(1 if math.copysign(1.0, num) < 0 else 0)
+        return self._int.unpack(packed)[0]
+
+    def decode(self, bits):
+        """Упакованный код -> число Python"""
+        return self._float.unpack(self._int.pack(bits & self.mask))[0]
+
+    def fields(self, bits):
+        """Разбор кода на (знак, смещённый порядок, мантисса)"""
+        return (bits >> (self.total_bits - 1),
+                (bits >> self.mantissa_bits) & self.exponent_mask,
+                bits & self.mantissa_mask)
+
+    def pack_fields(self, sign, exponent, mantissa):
+        return (sign << (self.total_bits - 1)) | (exponent << self.mantissa_bits) | mantissa
+
+    def format_bits(self, bits):
+        return format(bits & self.mask, f'0{self.total_bits}b')
+
+    def to_string(self, num):
+        return self.format_bits(self.encode(num))
+
+    def from_string(self, binary):
+        if len(binary) != self.total_bits:
+            raise ValueError(f"Ожидается строка из {self.total_bits} бит")
+        return self.decode(int(binary, 2))
+
+    def quiet_nan(self, bits=None):
+        quiet = 1 << (self.mantissa_bits - 1)
+        if bits is None:
+            return self.infinity() | quiet
+        return bits | quiet
+
+    def max_finite(self, sign=0):
+        return self.pack_fields(sign, self.exponent_mask - 1, self.mantissa_mask)
+
+    def add(self, a, b, rounding='nearest_even'):
+        """Сложение кодов a + b на уровне полей знака, порядка и мантиссы"""
+        if rounding not in ROUNDING_MODES:
+            raise ValueError(f"Неизвестный режим округления: {rounding}")
+        sa, ea, ma = self.fields(a)
+        sb, eb, mb = self.fields(b)
+        if ea == self.exponent_mask or eb == self.exponent_mask:
+            return self._add_special(a, b)
+
+        # Денормализованные числа имеют порядок 1 и не имеют скрытой единицы
+        hidden = 1 << self.mantissa_bits
+        ma = (ma | hidden if ea else ma) << GUARD_BITS
+        mb = (mb | hidden if eb else mb) << GUARD_BITS
+        ea, eb = max(ea, 1), max(eb, 1)
+        if (ea, ma) < (eb, mb):
+            sa, ea, ma, sb, eb, mb = sb, eb, mb, sa, ea, ma
+
+        # Выравнивание порядков: вытесненные биты собираются в липкий бит
+        shift = ea - eb
+        if shift:
+            sticky = 1 if mb & ((1 << shift) - 1) else 0
+            mb = (mb >> shift) | sticky
+
+        m = ma + mb if sa == sb else ma - mb
+        if m == 0:
+            sign = sa if sa == sb else int(rounding == 'down')
+            return self.pack_fields(sign, 0, 0)
+
+        # Нормализация: старшая единица мантиссы встаёт на место скрытого бита
+        e = ea
+        width = self.mantissa_bits + GUARD_BITS + 1
+        if m >> width:
+            m = (m >> 1) | (m & 1)
+            e += 1
+        else:
+            shift = min(width - m.bit_length(), e - 1)
+            if shift > 0:
+                m <<= shift
+                e -= shift
+        return self._round(sa, e, m, rounding)
+
+    def subtract(self, a, b, rounding='nearest_even'):
+        return self.add(a, b ^ self.sign_bit, rounding)
+
+    def _add_special(self, a, b):
+        sa, ea, ma = self.fields(a)
+        sb, eb, mb = self.fields(b)
+        if ea == self.exponent_mask and ma:
+            return self.quiet_nan(a)
+        if eb == self.exponent_mask and mb:
+            return self.quiet_nan(b)
+        if ea == self.exponent_mask:
+            # inf + (-inf) не определено
+            return self.quiet_nan() if eb == self.exponent_mask and sa != sb else a
+        return b
+
+    def _round(self, sign, e, m, rounding):
+        rest = m & ((1 << GUARD_BITS) - 1)
+        m >>= GUARD_BITS
+        half = 1 << (GUARD_BITS - 1)
+        if rounding == 'nearest_even':
+            round_up = rest > half or (rest == half and m & 1)
+        elif rounding == 'toward_zero':
+            round_up = False
+        else:
+            round_up = rest and sign == (rounding == 'down')
+        if round_up:
+            m += 1
+            if m >> (self.mantissa_bits + 1):
+                m >>= 1
+                e += 1
+        if e >= self.exponent_mask:
+            return self._overflow(sign, rounding)
+        if not m >> self.mantissa_bits:
+            e = 0
+        return self.pack_fields(sign, e, m & self.mantissa_mask)
+
+    def _overflow(self, sign, rounding):
+        if rounding == 'nearest_even' or rounding == ('down' if sign else 'up'):
+            return self.infinity(sign)
+        return self.max_finite(sign)
@@ -1,4 +1,11 @@
 # main.py
+import argparse
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'common'))
+
+from jsonl import write_jsonl
 from number_operations import NumberOperations
 
 
@@ -92,5 +99,81 @@ def main():
         print(f"Результат (двоичный, IEEE 754): [ {result_bin[0]} {result_bin[1:9]} {result_bin[9:]} ]")
 
 
+def read_operations(lines):
+    """Генератор (номер строки, поля) из строк вида '<операция> <число1> <число2>'"""
+    for number, line in enumerate(lines, 1):
+        fields = line.split()
+        if fields and not fields[0].startswith('#'):
+            yield number, fields
+
+
+def evaluate_operation(no, number, fields):
+    """Выполнение одной операции; ошибки возвращаются как запись с полем error"""
+    record = {"line": number}
+    try:
+        if len(fields) != 3:
+            raise ValueError("Ожидается строка вида: <операция> <число1> <число2>")
+        op, a, b = fields
+        record["op"] = op
+        if op == "fadd":
+            a, b = float(a.replace(',', '.')), float(b.replace(',', '.'))
+            result, binary = no.add_floating_point(a, b)
+        else:
+            a, b = int(a), int(b)
+            if op == "add":
+                binary = no.add_complement_code(a, b)
+                result = no.binary_to_decimal(binary)
+            elif op == "sub":
+                binary = no.subtract_complement_code(a, b)
+                result = no.binary_to_decimal(binary)
+            elif op == "mul":
+                binary = ''.join(map(str, no.multiply_direct_code(a, b)))
+                result = a * b
+            elif op == "div":
+                if b == 0:
+                    raise ValueError("Деление на ноль!")
+                binary, result = no.divide_direct_code(a, b)
+            else:
+                raise ValueError(f"Неизвестная операция: {op}")
+        record.update(a=a, b=b, result=result, binary=binary)
+    except (ValueError, ArithmeticError) as e:
+        # OverflowError и подобные тоже становятся записью, а не обрывают поток
+        record["error"] = str(e)
+    return record
+
+
+def run_operations(lines, no=None):
+    """Ленивый конвейер: строки входа -> записи с результатами"""
+    no = no or NumberOperations()
+    for number, fields in read_operations(lines):
+        yield evaluate_operation(no, number, fields)
+
+
+def run_batch(source='-', target='-'):
+    infile = sys.stdin if source == '-' else open(source, encoding='utf-8')
+    outfile = sys.stdout if target == '-' else open(target, 'w', encoding='utf-8')
+    try:
+        write_jsonl(run_operations(infile), outfile)
+    finally:
+        if infile is not sys.stdin:
+            infile.close()
+        if outfile is not sys.stdout:
+            outfile.close()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Операции над числами в прямом, обратном и дополнительном кодах")
+    parser.add_argument('--batch', nargs='?', const='-', metavar='ФАЙЛ',
+                        help="потоковый режим: строки '<операция> <число1> <число2>' (add, sub, mul, div, fadd) "
+                             "из файла или stdin, по одной JSON-записи на операцию")
+    parser.add_argument('-o', '--output', default='-', metavar='ФАЙЛ',
+                        help="файл для JSONL-результатов (по умолчанию stdout)")
+    return parser.parse_args(argv)
+
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    args = parse_args()
+    if args.batch is not None:
+        run_batch(args.batch, args.output)
+    else:
+        main()
\ No newline at end of file
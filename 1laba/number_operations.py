@@ -1,51 +1,37 @@
+import os
+import sys
+from math import gcd
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'common'))
+
+from bitvector import BitVector
+from fixed_width import TwosComplement
+from ieee754 import IEEE754Codec
+
+
 class NumberOperations:
     def __init__(self):
         self.TOTAL_BITS = 32
         self.MAX_BITS = 31
         self.EXPONENT_BITS = 127
         self.MANTISSA_BITS = 23
+        self.engine = TwosComplement(self.TOTAL_BITS)
+        self.ieee754 = IEEE754Codec('single')
 
     def to_binary(self, n, bits=32):
         if n == 0:
             return [0] * bits
-        sign = 0 if n >= 0 else 1
-        abs_n = abs(n)
-        binary = []
-        while abs_n > 0:
-            binary.append(abs_n % 2)
-            abs_n = abs_n // 2
-        binary = binary[::-1]
-        while len(binary) < bits - 1:
-            binary.insert(0, 0)
-        return [sign] + binary if bits == 32 else binary
+        magnitude = BitVector(abs(n), max(abs(n).bit_length(), bits - 1))
+        return (BitVector(n < 0, 1) + magnitude).to_list() if bits == 32 else magnitude.to_list()
 
     def to_direct_code(self, n):
-        binary = self.to_binary(n)
-        return ''.join(map(str, binary))
+        return self.engine.to_direct_code(n)
 
     def to_inverse_code(self, n):
-        if n >= 0:
-            return self.to_direct_code(n)
-        abs_n = abs(n)
-        binary = self.to_binary(abs_n)
-        inverted = [1 - bit for bit in binary[1:]]
-        return '1' + ''.join(map(str, inverted))
+        return self.engine.to_inverse_code(n)
 
     def to_complement_code(self, n):
-        if n >= 0:
-            return self.to_direct_code(n)
-        inverse = self.to_inverse_code(n)
-        # Добавляем 1 к обратному коду
-        carry = 1
-        complement = list(inverse)
-        for i in range(len(complement) - 1, 0, -1):
-            if complement[i] == '0' and carry == 1:
-                complement[i] = '1'
-                carry = 0
-                break
-            elif complement[i] == '1' and carry == 1:
-                complement[i] = '0'
-        return ''.join(complement)
+        return self.engine.to_complement_code(n)
 
     def binary_to_decimal(self, binary_str):
         if binary_str[0] == '0':
@@ -57,115 +43,86 @@ class NumberOperations:
 
     def add_binary(self, a, b):
         max_len = max(len(a), len(b))
-        a = a.zfill(max_len)
-        b = b.zfill(max_len)
-        carry = 0
-        result = []
-        for i in range(max_len - 1, -1, -1):
-            sum_bits = int(a[i]) + int(b[i]) + carry
-            result.append(str(sum_bits % 2))
-            carry = sum_bits // 2
-        if carry:
-            result.append('1')
-        return ''.join(reversed(result))[-max_len:]
+        total = (int(a, 2) + int(b, 2)) & ((1 << max_len) - 1)
+        return format(total, f'0{max_len}b')
 
     def add_complement_code(self, a, b):
-        a_bin = self.to_complement_code(a)
-        b_bin = self.to_complement_code(b)
-        result = self.add_binary(a_bin, b_bin)
-        return result
+        result, _, _ = self.engine.add(self.engine.encode(a), self.engine.encode(b))
+        return self.engine.to_string(result)
 
     def subtract_complement_code(self, a, b):
-        return self.add_complement_code(a, -b)
+        result, _, _ = self.engine.subtract(self.engine.encode(a), self.engine.encode(b))
+        return self.engine.to_string(result)
 
     def multiply_direct_code(self, a, b):
-        sign = 0 if (a >= 0) == (b >= 0) else 1
-        abs_a = abs(a)
-        abs_b = abs(b)
-        product = abs_a * abs_b
-        binary = self.to_binary(product if sign == 0 else -product)
-        return binary
+        product = self.engine.multiply(self.engine.encode(a), self.engine.encode(b))
+        return self.to_binary(product)
 
     def divide_direct_code(self, a, b, precision=13):
         if b == 0:
             return "Деление на ноль!", 0
+        # Те же 32 бита, что и у остальных операций в прямом коде
+        self.engine.encode(a)
+        self.engine.encode(b)
         sign = 0 if (a >= 0) == (b >= 0) else 1
-        abs_a = abs(a)
-        abs_b = abs(b)
 
         # Более точное вычисление
         decimal_result = round(a / b, 6)  # 6 знаков после запятой
 
-        # Для бинарного представления
-        quotient = abs_a // abs_b
-        remainder = abs_a % abs_b
-        fractional = []
-        for _ in range(precision):
-            remainder *= 2
-            bit = 1 if remainder >= abs_b else 0
-            fractional.append(bit)
-            if bit == 1:
-                remainder -= abs_b
-
-        integer_part = self.to_binary(quotient, 32)[1:]
-        result_str = f"{sign} {''.join(map(str, integer_part))}.{''.join(map(str, fractional))}"
+        # Для бинарного представления делимое сдвигается на precision дробных разрядов
+        quotient, _ = self.engine.divide_unsigned(abs(a) << precision, abs(b))
+        integer_part = self.to_binary(quotient >> precision, 32)[1:]
+        fractional = format(quotient & ((1 << precision) - 1), f'0{precision}b') if precision else ''
+        result_str = f"{sign} {''.join(map(str, integer_part))}.{fractional}"
         return result_str, decimal_result
 
+    def binary_expansion(self, a, b, max_period=None):
+        """Точное двоичное разложение a/b для целых любой длины.
+
+        Возвращает (знак, целая часть, предпериод, период) строками битов.
+        Предпериод равен степени двойки в несократимом знаменателе, а длина
+        периода - порядку двойки по модулю его нечётной части; ищется она
+        удвоением остатка до возврата к 1, без хранения промежуточных остатков.
+        """
+        if b == 0:
+            raise ZeroDivisionError("Деление на ноль!")
+        sign = 1 if (a < 0) != (b < 0) and a != 0 else 0
+        integer, remainder = divmod(abs(a), abs(b))
+        common = gcd(remainder, abs(b))
+        remainder, denominator = remainder // common, abs(b) // common
+
+        pre_period = (denominator & -denominator).bit_length() - 1
+        odd = denominator >> pre_period
+        prefix, remainder = divmod(remainder, odd)
+
+        period = 0
+        if remainder:
+            period, value = 1, 2 % odd
+            while value != 1:
+                if max_period is not None and period >= max_period:
+                    raise ValueError(f"Период длиннее {max_period} бит")
+                value = (value << 1) % odd
+                period += 1
+        block = remainder * ((1 << period) - 1) // odd
+
+        prefix_bits = format(prefix, f'0{pre_period}b') if pre_period else ''
+        period_bits = format(block, f'0{period}b') if period else ''
+        return sign, bin(integer)[2:], prefix_bits, period_bits
+
+    def divide_exact(self, a, b, max_period=None):
+        """Частное a/b в виде '-целая.предпериод(период)'"""
+        sign, integer, prefix, period = self.binary_expansion(a, b, max_period)
+        result = ('-' if sign else '') + integer
+        if prefix or period:
+            result += '.' + prefix + (f'({period})' if period else '')
+        return result
+
     def float_to_ieee754(self, num):
-        if num == 0:
-            return '0' * 32
-
-        sign = '0' if num >= 0 else '1'
-        abs_num = abs(num)
-
-        # Особый случай для целых чисел
-        if abs_num.is_integer():
-            integer = int(abs_num)
-            if integer == 0:
-                return '0' * 32
-            exponent = 0
-            while integer >= 2:
-                integer >>= 1
-                exponent += 1
-            mantissa = integer - 1
-            biased_exp = exponent + self.EXPONENT_BITS
-            return sign + bin(biased_exp)[2:].zfill(8) + '0' * 23
-
-        # Обычный случай для дробных чисел
-        exponent = 0
-        if abs_num >= 2:
-            while abs_num >= 2:
-                abs_num /= 2
-                exponent += 1
-        else:
-            while abs_num < 1:
-                abs_num *= 2
-                exponent -= 1
-
-        mantissa = abs_num - 1
-        mant_bin = ''
-        for _ in range(self.MANTISSA_BITS):
-            mantissa *= 2
-            mant_bin += '1' if mantissa >= 1 else '0'
-            if mantissa >= 1:
-                mantissa -= 1
-
-        biased_exp = exponent + self.EXPONENT_BITS
-        exp_bin = bin(biased_exp)[2:].zfill(8)
-        return sign + exp_bin + mant_bin
+        return self.ieee754.to_string(num)
 
     def ieee754_to_float(self, binary):
-        if binary == '0' * 32:
-            return 0.0
-        sign = -1 if binary[0] == '1' else 1
-        exponent = int(binary[1:9], 2) - self.EXPONENT_BITS
-        mantissa = 1.0
-        for i, bit in enumerate(binary[9:32]):
-            mantissa += int(bit) * (2 ** -(i + 1))
-        return sign * mantissa * (2 ** exponent)
+        return self.ieee754.from_string(binary)
 
     def add_floating_point(self, a, b):
-        a_dec = self.ieee754_to_float(self.float_to_ieee754(a))
-        b_dec = self.ieee754_to_float(self.float_to_ieee754(b))
-        result = a_dec + b_dec
-        return round(result, 5), self.float_to_ieee754(result)
\ No newline at end of file
+        result = self.ieee754.add(self.ieee754.encode(a), self.ieee754.encode(b))
+        return round(self.ieee754.decode(result), 5), self.ieee754.format_bits(result)
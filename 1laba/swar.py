@@ -0,0 +1,104 @@
+import numpy as np
+
+
+class PackedLanes:
+    """Арифметика SWAR: много узких чисел в дополнительном коде внутри одного слова.
+
+    Дорожка 0 занимает младшие биты. Слово - это либо большое целое Python
+    (lanes дорожек по lane_bits бит), либо массив NumPy uint64, тогда
+    lane_bits * lanes должно равняться 64. Сложение и вычитание изолируют
+    переносы старшим битом каждой дорожки, поэтому все дорожки
+    обрабатываются одной операцией над словом.
+    """
+
+    def __init__(self, lane_bits=8, lanes=8):
+        if lane_bits < 2 or lanes < 1:
+            raise ValueError("Нужна хотя бы одна дорожка шириной не меньше 2 бит")
+        self.lane_bits = lane_bits
+        self.lanes = lanes
+        self.total_bits = lane_bits * lanes
+        self.lane_mask = (1 << lane_bits) - 1
+        self.mask = (1 << self.total_bits) - 1
+        ones = self.mask // self.lane_mask
+        self.high = ones << (lane_bits - 1)
+        self.low = self.mask ^ self.high
+        self.min_value = -(1 << (lane_bits - 1))
+        self.max_value = (1 << (lane_bits - 1)) - 1
+        self._shifts = np.arange(lanes, dtype=np.uint64) * np.uint64(lane_bits)
+
+    def _masks(self, word):
+        if isinstance(word, np.ndarray):
+            if self.total_bits != 64:
+                raise ValueError("Для массивов NumPy дорожки должны заполнять 64-битное слово")
+            return np.uint64(self.low), np.uint64(self.high)
+        return self.low, self.high
+
+    def _check_range(self, values):
+        if values and not (self.min_value <= min(values) and max(values) <= self.max_value):
+            raise ValueError(f"Значения должны быть в диапазоне [{self.min_value}, {self.max_value}]")
+
+    def pack(self, values):
+        """Список знаковых чисел -> слово (большое целое)"""
+        values = list(values)
+        if len(values) > self.lanes:
+            raise ValueError(f"Слово вмещает не больше {self.lanes} дорожек")
+        self._check_range(values)
+        word = 0
+        for i, value in enumerate(values):
+            word |= (value & self.lane_mask) << (i * self.lane_bits)
+        return word
+
+    def unpack(self, word):
+        """Слово -> список знаковых чисел всех дорожек"""
+        values = []
+        sign = 1 << (self.lane_bits - 1)
+        for i in range(self.lanes):
+            value = (word >> (i * self.lane_bits)) & self.lane_mask
+            values.append(value - (value & sign) * 2)
+        return values
+
+    def pack_array(self, values):
+        """Массив знаковых чисел -> массив слов uint64; хвост дополняется нулями"""
+        if self.total_bits != 64:
+            raise ValueError("Для массивов NumPy дорожки должны заполнять 64-битное слово")
+        values = np.asarray(values, dtype=np.int64).ravel()
+        if values.size and (values.min() < self.min_value or values.max() > self.max_value):
+            raise ValueError(f"Значения должны быть в диапазоне [{self.min_value}, {self.max_value}]")
+        padded = np.zeros(-(-values.size // self.lanes) * self.lanes, dtype=np.int64)
+        padded[:values.size] = values
+        lanes = (padded.reshape(-1, self.lanes).astype(np.uint64) & np.uint64(self.lane_mask)) << self._shifts
+        return np.bitwise_or.reduce(lanes, axis=1)
+
+    def unpack_array(self, words, count=None):
+        """Массив слов uint64 -> плоский массив знаковых чисел (первые count)"""
+        lanes = (np.asarray(words, dtype=np.uint64)[:, None] >> self._shifts) & np.uint64(self.lane_mask)
+        values = lanes.astype(np.int64).ravel()
+        values -= (values >> (self.lane_bits - 1) & 1) << self.lane_bits
+        return values if count is None else values[:count]
+
+    def add(self, x, y):
+        """Сложение всех дорожек. Возвращает (слово, маска переполнения по старшим битам дорожек)"""
+        low, high = self._masks(x)
+        result = ((x & low) + (y & low)) ^ ((x ^ y) & high)
+        overflow = ~(x ^ y) & (x ^ result) & high
+        return result, overflow
+
+    def subtract(self, x, y):
+        """Вычитание всех дорожек x - y без заёма между дорожками"""
+        low, high = self._masks(x)
+        result = ((x | high) - (y & low)) ^ ((x ^ ~y) & high)
+        overflow = (x ^ y) & (x ^ result) & high
+        return result, overflow
+
+    def negate(self, x):
+        return self.subtract(x & 0, x)
+
+    def overflow_lanes(self, overflow):
+        """Маска переполнения -> номера переполнившихся дорожек.
+
+        Для массива слов возвращается плоский булев массив по всем дорожкам.
+        """
+        if isinstance(overflow, np.ndarray):
+            top = self._shifts + np.uint64(self.lane_bits - 1)
+            return ((overflow[:, None] >> top) & np.uint64(1)).astype(bool).ravel()
+        return [i for i in range(self.lanes) if (overflow >> ((i + 1) * self.lane_bits - 1)) & 1]
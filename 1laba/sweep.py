@@ -0,0 +1,175 @@
+import argparse
+import json
+import math
+import os
+import struct
+import sys
+from multiprocessing import Pool
+
+import numpy as np
+
+from batch_operations import BatchNumberOperations
+from number_operations import NumberOperations
+
+DOMAIN_BITS = 32
+CHECKS = ('complement', 'binary_to_decimal', 'ieee754')
+# Сколько расхождений на фрагмент сохраняется в отчёте
+MAX_REPORTED = 16
+# Сколько слов каждого фрагмента сверяется ещё и со скалярными реализациями
+SAMPLE_SIZE = 256
+
+
+def _chunk_words(chunk_bits, index):
+    start = index << chunk_bits
+    return np.arange(start, start + (1 << chunk_bits), dtype=np.int64).astype(np.uint32)
+
+
+def _sample(words):
+    """Номера равномерной выборки слов фрагмента, включая первое и последнее"""
+    return np.unique(np.linspace(0, len(words) - 1, min(SAMPLE_SIZE, len(words))).astype(np.int64))
+
+
+def _mismatched(words, bad, scalar_bad):
+    """Отсортированные слова с расхождениями по всему фрагменту и по выборке"""
+    return np.union1d(words[bad], np.array(scalar_bad, dtype=np.uint32))
+
+
+def _check_complement(batch, scalar, words):
+    values = words.view(np.int32).astype(np.int64)
+    codes = batch.to_complement_code(values, output='words')
+    reference = np.frombuffer(struct.pack(f'>{len(values)}i', *values.tolist()), dtype='>u4')
+    # Выборка сверяется со строками скалярного движка TwosComplement
+    sample = words[_sample(words)]
+    sample_values = sample.view(np.int32).tolist()
+    strings = batch.to_complement_code(sample_values)
+    scalar_bad = [w for w, v, code in zip(sample.tolist(), sample_values, strings)
+                  if scalar.to_complement_code(v) != code]
+    return _mismatched(words, codes != reference, scalar_bad)
+
+
+def _check_binary_to_decimal(batch, scalar, words):
+    values = batch.binary_to_decimal(words)
+    reference = np.array(struct.unpack(f'>{len(words)}i', words.astype('>u4').tobytes()), dtype=np.int64)
+    # Выборка подаётся строками, чтобы проверялась и строковая ветвь разбора
+    sample = words[_sample(words)].tolist()
+    strings = [format(w, '032b') for w in sample]
+    parsed = batch.binary_to_decimal(strings).tolist()
+    scalar_bad = [w for w, code, value in zip(sample, strings, parsed)
+                  if scalar.binary_to_decimal(code) != value]
+    return _mismatched(words, values != reference, scalar_bad)
+
+
+def _same_float(a, b):
+    return (math.isnan(a) and math.isnan(b)) or (a == b and math.copysign(1.0, a) == math.copysign(1.0, b))
+
+
+def _check_ieee754(batch, scalar, words):
+    with np.errstate(invalid='ignore'):
+        floats = batch.ieee754_to_float(words).astype(np.float64)
+    reference = np.array(struct.unpack(f'>{len(words)}f', words.astype('>u4').tobytes()), dtype=np.float64)
+    nan = np.isnan(reference)
+    # struct может сделать сигнальный NaN тихим, поэтому NaN сравниваются только как NaN
+    decoded_ok = np.where(nan, np.isnan(floats), floats.view(np.uint64) == reference.view(np.uint64))
+    encoded = batch.float_to_ieee754(floats, output='words')
+    encoded_ok = nan | (encoded == words)
+
+    codec = scalar.ieee754
+    indices = _sample(words)
+    sample = words[indices]
+    scalar_bad = []
+    for w, batch_value in zip(sample.tolist(), floats[indices].tolist()):
+        value = codec.decode(w)
+        if not _same_float(value, batch_value) or (not math.isnan(value) and codec.encode(value) != w):
+            scalar_bad.append(w)
+    # Округление к чётному: точки между соседними кодами кодируются как у IEEE754Codec
+    sample = sample[sample != np.uint32(0xFFFFFFFF)]
+    with np.errstate(invalid='ignore', over='ignore'):
+        low = sample.view(np.float32).astype(np.float64)
+        high = (sample + np.uint32(1)).view(np.float32).astype(np.float64)
+        finite = np.isfinite(low) & np.isfinite(high) & ((sample >> 31) == ((sample + np.uint32(1)) >> 31))
+        for fraction in (0.25, 0.5, 0.75):
+            points = low[finite] + (high[finite] - low[finite]) * fraction
+            rounded = batch.float_to_ieee754(points, output='words').tolist()
+            scalar_bad += [w for w, p, r in zip(sample[finite].tolist(), points.tolist(), rounded)
+                           if codec.encode(p) != r]
+    return _mismatched(words, ~(decoded_ok & encoded_ok), scalar_bad)
+
+
+CHECKERS = {
+    'complement': _check_complement,
+    'binary_to_decimal': _check_binary_to_decimal,
+    'ieee754': _check_ieee754,
+}
+
+
+def check_chunk(task):
+    """Проверка одного фрагмента домена. task = (проверка, бит на фрагмент, номер фрагмента).
+
+    Весь фрагмент сверяется со struct, выборка из него - со скалярными
+    NumberOperations и IEEE754Codec. Расхождения - входные слова.
+    """
+    check, chunk_bits, index = task
+    mismatches = CHECKERS[check](BatchNumberOperations(), NumberOperations(), _chunk_words(chunk_bits, index))
+    return index, len(mismatches), [int(m) for m in mismatches[:MAX_REPORTED]]
+
+
+def load_checkpoint(path, check, chunk_bits):
+    state = {"check": check, "chunk_bits": chunk_bits, "done": [], "mismatch_count": 0, "mismatches": []}
+    if path and os.path.exists(path):
+        with open(path, encoding='utf-8') as f:
+            saved = json.load(f)
+        if saved.get("check") != check or saved.get("chunk_bits") != chunk_bits:
+            raise ValueError(f"Контрольная точка {path} создана для другой проверки или размера фрагмента")
+        state.update(saved)
+    return state
+
+
+def save_checkpoint(path, state):
+    if not path:
+        return
+    tmp = path + '.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(state, f)
+    os.replace(tmp, path)
+
+
+def run_sweep(check, chunk_bits=20, workers=None, checkpoint=None, first=0, last=None, out=sys.stdout):
+    """Проверка фрагментов first..last-1 на пуле процессов с возобновлением по контрольной точке"""
+    if check not in CHECKERS:
+        raise ValueError(f"Неизвестная проверка: {check}")
+    total = 1 << (DOMAIN_BITS - chunk_bits)
+    last = total if last is None else min(last, total)
+    state = load_checkpoint(checkpoint, check, chunk_bits)
+    done = set(state["done"])
+    pending = [(check, chunk_bits, i) for i in range(first, last) if i not in done]
+    print(f"{check}: фрагментов {last - first}, уже проверено {last - first - len(pending)}", file=out)
+
+    with Pool(workers) as pool:
+        for index, count, sample in pool.imap_unordered(check_chunk, pending):
+            done.add(index)
+            state["done"].append(index)
+            state["mismatch_count"] += count
+            state["mismatches"].extend(sample[:MAX_REPORTED - len(state["mismatches"])])
+            save_checkpoint(checkpoint, state)
+            if count:
+                print(f"Фрагмент {index}: расхождений {count}, например {sample[:4]}", file=out)
+
+    print(f"{check}: проверено {len(done)} из {total} фрагментов, расхождений {state['mismatch_count']}", file=out)
+    return state
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Полная проверка векторных преобразований на всём 32-битном домене")
+    parser.add_argument('check', choices=CHECKS)
+    parser.add_argument('--chunk-bits', type=int, default=20, help="log2 размера фрагмента (по умолчанию 20)")
+    parser.add_argument('--workers', type=int, default=None, help="число процессов (по умолчанию по числу ядер)")
+    parser.add_argument('--checkpoint', default=None, help="JSON-файл контрольной точки для возобновления")
+    parser.add_argument('--first', type=int, default=0, help="номер первого фрагмента")
+    parser.add_argument('--last', type=int, default=None, help="номер фрагмента, на котором остановиться")
+    args = parser.parse_args(argv)
+    state = run_sweep(args.check, args.chunk_bits, args.workers, args.checkpoint, args.first, args.last)
+    return 1 if state["mismatch_count"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,20 @@
+import io
+import json
+import math
+import os
+import random
+import tempfile
 import unittest
+from unittest.mock import patch
+
+import numpy as np
 from number_operations import NumberOperations
+from batch_operations import BatchNumberOperations
+from fixed_width import TwosComplement
+from ieee754 import IEEE754Codec, ROUNDING_MODES
+from main import run_operations, write_jsonl
+from swar import PackedLanes
+from sweep import check_chunk, run_sweep
 
 
 class TestNumberOperations(unittest.TestCase):
@@ -74,6 +89,20 @@ class TestNumberOperations(unittest.TestCase):
         self.assertEqual(result_str, "Деление на ноль!")
         self.assertEqual(decimal_result, 0)
 
+    def test_divide_exact(self):
+        self.assertEqual(self.ops.divide_exact(1, 3), '0.(01)')
+        self.assertEqual(self.ops.divide_exact(1, 10), '0.0(0011)')
+        self.assertEqual(self.ops.divide_exact(-7, 4), '-1.11')
+        self.assertEqual(self.ops.divide_exact(1, -12), '-0.00(01)')
+        self.assertEqual(self.ops.divide_exact(6, 3), '10')
+        self.assertEqual(self.ops.binary_expansion(2 ** 200 + 1, 2 ** 100), (0, '1' + '0' * 100, '0' * 99 + '1', ''))
+        sign, integer, prefix, period = self.ops.binary_expansion(1, 2 ** 61 - 1)
+        self.assertEqual((integer, prefix, len(period)), ('0', '', 61))
+        with self.assertRaises(ValueError):
+            self.ops.divide_exact(1, 1000003, max_period=64)
+        with self.assertRaises(ZeroDivisionError):
+            self.ops.divide_exact(1, 0)
+
     def test_float_to_ieee754(self):
         self.assertEqual(self.ops.float_to_ieee754(0), '0' * 32)
         self.assertEqual(self.ops.float_to_ieee754(1.0), '0' + '01111111' + '0' * 23)
@@ -101,5 +130,339 @@ class TestNumberOperations(unittest.TestCase):
         self.assertAlmostEqual(result, 0.0, places=5)
 
 
+class TestBatchNumberOperations(unittest.TestCase):
+    def setUp(self):
+        self.ops = NumberOperations()
+        self.batch = BatchNumberOperations()
+        self.values = [0, 1, -1, 5, -5, 127, -128, 2 ** 31 - 1, -(2 ** 31 - 1), 123456789, -987654321]
+
+    def test_codes_match_scalar(self):
+        for name in ('to_direct_code', 'to_inverse_code', 'to_complement_code'):
+            expected = [getattr(self.ops, name)(n) for n in self.values]
+            self.assertEqual(list(getattr(self.batch, name)(self.values)), expected)
+
+    def test_output_formats(self):
+        bits = self.batch.to_complement_code([-5], output='bits')
+        self.assertEqual(bits.shape, (1, 32))
+        self.assertEqual(''.join(map(str, bits[0])), self.ops.to_complement_code(-5))
+        self.assertEqual(self.batch.to_direct_code([-5], output='bytes')[0], self.ops.to_direct_code(-5).encode())
+        self.assertEqual(int(self.batch.to_complement_code([-1], output='words')[0]), 0xFFFFFFFF)
+
+    def test_out_of_range(self):
+        with self.assertRaises(ValueError):
+            self.batch.to_direct_code([2 ** 31])
+        with self.assertRaises(ValueError):
+            self.batch.to_inverse_code([-(2 ** 31)])
+        self.assertEqual(self.batch.to_complement_code([-(2 ** 31)])[0], '1' + '0' * 31)
+        for values in ([2 ** 70], [1, -(2 ** 64)], np.array([2 ** 64 - 1], dtype=np.uint64)):
+            with self.assertRaises(ValueError):
+                self.batch.to_complement_code(values)
+
+    def test_non_integer_input(self):
+        for values in (np.array([1.7, -2.9]), [1, 2.0], ['1'], [1, 1.5 + 2j], [1, None]):
+            with self.assertRaises(ValueError):
+                self.batch.to_direct_code(values)
+        self.assertEqual(list(self.batch.to_complement_code([True, np.int8(-1)])),
+                         [self.ops.to_complement_code(1), self.ops.to_complement_code(-1)])
+        self.assertEqual(len(self.batch.to_direct_code([])), 0)
+
+    def test_malformed_strings(self):
+        self.assertEqual(list(self.batch.binary_to_decimal(['1' * 29 + '011', '0' * 29 + '101'])), [-5, 5])
+        for codes in (['0' * 33], ['0' * 31], ['1' * 31 + '2'], [b'0' * 31 + b' ']):
+            with self.assertRaises(ValueError):
+                self.batch.binary_to_decimal(codes)
+
+
+class TestTwosComplement(unittest.TestCase):
+    def test_encode_decode(self):
+        engine = TwosComplement(8)
+        self.assertEqual(engine.encode(-1), 0xFF)
+        self.assertEqual(engine.decode(0x80), -128)
+        self.assertEqual(engine.decode(engine.encode(100)), 100)
+        with self.assertRaises(ValueError):
+            engine.encode(128)
+
+    def test_add_flags(self):
+        engine = TwosComplement(8)
+        self.assertEqual(engine.add(engine.encode(100), engine.encode(27)), (127, 0, False))
+        self.assertEqual(engine.add(engine.encode(100), engine.encode(28)), (0x80, 0, True))
+        self.assertEqual(engine.add(engine.encode(-1), engine.encode(1)), (0, 1, False))
+        self.assertEqual(engine.add(engine.encode(-128), engine.encode(-1)), (0x7F, 1, True))
+
+    def test_subtract_negate(self):
+        engine = TwosComplement(16)
+        result, carry, overflow = engine.subtract(engine.encode(3), engine.encode(5))
+        self.assertEqual((engine.decode(result), carry, overflow), (-2, 0, False))
+        result, _, overflow = engine.subtract(engine.encode(-32768), engine.encode(1))
+        self.assertEqual((engine.decode(result), overflow), (32767, True))
+        self.assertEqual(engine.negate(engine.encode(5)), (engine.encode(-5), False))
+        self.assertEqual(engine.negate(engine.encode(-32768)), (0x8000, True))
+
+    def test_codes_match_number_operations(self):
+        ops = NumberOperations()
+        cases = {
+            0: ('0' * 32, '0' * 32, '0' * 32),
+            5: ('0' * 29 + '101', '0' * 29 + '101', '0' * 29 + '101'),
+            -5: ('1' + '0' * 28 + '101', '1' * 29 + '010', '1' * 29 + '011'),
+            2 ** 31 - 1: ('0' + '1' * 31, '0' + '1' * 31, '0' + '1' * 31),
+            -(2 ** 31 - 1): ('1' * 32, '1' + '0' * 31, '1' + '0' * 30 + '1'),
+        }
+        for n, (direct, inverse, complement) in cases.items():
+            self.assertEqual(ops.to_direct_code(n), direct)
+            self.assertEqual(ops.to_inverse_code(n), inverse)
+            self.assertEqual(ops.to_complement_code(n), complement)
+        self.assertEqual(TwosComplement(8).to_complement_code(-5), '11111011')
+
+    def test_wide_engine(self):
+        engine = TwosComplement(128)
+        big = 2 ** 100
+        result, _, overflow = engine.add(engine.encode(big), engine.encode(-big - 1))
+        self.assertEqual((engine.decode(result), overflow), (-1, False))
+        self.assertEqual(engine.to_complement_code(-1), '1' * 128)
+
+    def test_booth_multiply(self):
+        rnd = random.Random(5)
+        for bits in (7, 8, 32):
+            engine = TwosComplement(bits)
+            for _ in range(200):
+                a = rnd.randint(engine.min_value, engine.max_value)
+                b = rnd.randint(engine.min_value, engine.max_value)
+                self.assertEqual(engine.multiply(engine.encode(a), engine.encode(b)), a * b)
+
+    def test_multiply_steps(self):
+        engine = TwosComplement(8)
+        steps = list(engine.multiply_steps(engine.encode(-7), engine.encode(5)))
+        self.assertEqual(len(steps), 4)
+        self.assertEqual([digit for _, digit, _, _ in steps], [1, 1, 0, 0])
+        self.assertEqual(steps[-1][3], -35)
+
+    def test_non_restoring_divide(self):
+        engine = TwosComplement(16)
+        self.assertEqual(engine.divide_unsigned(13, 4), (3, 1))
+        self.assertEqual(engine.divide_unsigned(2 ** 100 + 7, 2 ** 50), (2 ** 50, 7))
+        quotient, remainder, overflow = engine.divide(engine.encode(-7), engine.encode(2))
+        self.assertEqual((engine.decode(quotient), engine.decode(remainder), overflow), (-3, -1, False))
+        self.assertTrue(engine.divide(engine.encode(-32768), engine.encode(-1))[2])
+        with self.assertRaises(ZeroDivisionError):
+            engine.divide(1, 0)
+
+    def test_divide_steps(self):
+        engine = TwosComplement(8)
+        steps = list(engine.divide_steps(13, 4))
+        self.assertEqual([bit for bit, _, _ in steps], [3, 2, 1, 0])
+        self.assertEqual(steps[-1][2], 3)
+
+    def test_steps_match_fast_path(self):
+        rnd = random.Random(11)
+        engine = TwosComplement(16)
+        for _ in range(200):
+            a, b = engine.encode(rnd.randint(-32768, 32767)), engine.encode(rnd.randint(-32768, 32767))
+            self.assertEqual(list(engine.multiply_steps(a, b))[-1][3], engine.multiply(a, b))
+            dividend, divisor = rnd.getrandbits(80), rnd.randint(1, 2 ** 40)
+            _, remainder, quotient = list(engine.divide_steps(dividend, divisor))[-1]
+            self.assertEqual((quotient, remainder + (divisor if remainder < 0 else 0)),
+                             engine.divide_unsigned(dividend, divisor))
+
+
+class TestIEEE754Codec(unittest.TestCase):
+    def test_integer_mantissa_kept(self):
+        ops = NumberOperations()
+        self.assertEqual(ops.float_to_ieee754(3.0), '0' + '10000000' + '1' + '0' * 22)
+        self.assertEqual(ops.ieee754_to_float(ops.float_to_ieee754(3.0)), 3.0)
+
+    def test_special_values(self):
+        codec = IEEE754Codec('single')
+        self.assertEqual(codec.encode(float('inf')), 0x7F800000)
+        self.assertEqual(codec.encode(-1e39), 0xFF800000)
+        self.assertEqual(codec.encode(-0.0), 0x80000000)
+        self.assertEqual(codec.encode(1e-45), 0x00000001)
+        self.assertTrue(math.isnan(codec.decode(0x7FC00000)))
+        self.assertEqual(codec.fields(codec.encode(-2.5)), (1, 128, 1 << 21))
+
+    def test_round_to_nearest_even(self):
+        half = IEEE754Codec('half')
+        self.assertEqual(half.encode(2049.0), half.encode(2048.0))
+        self.assertEqual(half.encode(2051.0), half.encode(2052.0))
+        self.assertEqual(half.encode(65520.0), half.infinity())
+        double = IEEE754Codec('double')
+        self.assertEqual(double.decode(double.encode(0.1)), 0.1)
+
+    def test_batch_matches_scalar(self):
+        batch = BatchNumberOperations()
+        values = [0.0, 1.0, 3.0, 0.1, -2.5, 1e-40, 1e39, float('inf')]
+        for precision in ('half', 'single', 'double'):
+            codec = IEEE754Codec(precision)
+            words = batch.float_to_ieee754(values, precision, output='words')
+            self.assertEqual([int(w) for w in words], [codec.encode(v) for v in values])
+            decoded = batch.ieee754_to_float(batch.float_to_ieee754(values, precision), precision)
+            self.assertEqual(list(decoded), [codec.decode(codec.encode(v)) for v in values])
+
+
+class TestIEEE754Adder(unittest.TestCase):
+    def setUp(self):
+        self.codec = IEEE754Codec('single')
+        rnd = random.Random(754)
+        self.a = [rnd.getrandbits(32) for _ in range(2000)]
+        # Половина пар с близкими порядками, чтобы проверить вычитание с потерей разрядов
+        self.b = [rnd.getrandbits(32) if i % 2 else a ^ rnd.getrandbits(25) ^ (rnd.getrandbits(1) << 31)
+                  for i, a in enumerate(self.a)]
+
+    def test_matches_native_addition(self):
+        with np.errstate(all='ignore'):
+            native = (np.array(self.a, dtype=np.uint32).view(np.float32)
+                      + np.array(self.b, dtype=np.uint32).view(np.float32))
+        for a, b, expected in zip(self.a, self.b, native):
+            result = self.codec.add(a, b)
+            if math.isnan(expected):
+                self.assertTrue(math.isnan(self.codec.decode(result)))
+            else:
+                self.assertEqual(result, int(expected.view(np.uint32)))
+
+    def test_rounding_modes(self):
+        one = self.codec.encode(1.0)
+        tiny = self.codec.encode(2.0 ** -30)
+        self.assertEqual(self.codec.add(one, tiny), one)
+        self.assertEqual(self.codec.add(one, tiny, 'up'), one + 1)
+        self.assertEqual(self.codec.subtract(one, tiny, 'toward_zero'), self.codec.encode(1.0 - 2.0 ** -24))
+        self.assertEqual(self.codec.subtract(one, one, 'down'), self.codec.encode(-0.0))
+        largest = self.codec.max_finite()
+        self.assertEqual(self.codec.add(largest, largest), self.codec.infinity())
+        self.assertEqual(self.codec.add(largest, largest, 'toward_zero'), largest)
+
+    def test_special_values(self):
+        inf, ninf = self.codec.infinity(), self.codec.infinity(1)
+        self.assertTrue(math.isnan(self.codec.decode(self.codec.add(inf, ninf))))
+        self.assertEqual(self.codec.add(inf, self.codec.encode(1.0)), inf)
+        self.assertEqual(self.codec.add(self.codec.encode(-0.0), self.codec.encode(-0.0)), 0x80000000)
+
+    def test_batch_matches_scalar(self):
+        batch = BatchNumberOperations()
+        a = np.array(self.a, dtype=np.uint32)
+        b = np.array(self.b, dtype=np.uint32)
+        for rounding in ROUNDING_MODES:
+            result = batch.add_floating_point(a, b, rounding=rounding)
+            self.assertEqual([int(r) for r in result],
+                             [self.codec.add(x, y, rounding) for x, y in zip(self.a, self.b)])
+
+
+class TestBatchMode(unittest.TestCase):
+    def test_run_operations(self):
+        lines = ["add 5 3", "", "# комментарий", "mul -5 3", "fadd 1,5 2.5", "div 1 0", "pow 2 3"]
+        records = list(run_operations(lines))
+        self.assertEqual([r["line"] for r in records], [1, 4, 5, 6, 7])
+        self.assertEqual(records[0]["result"], 8)
+        self.assertEqual(records[0]["binary"], NumberOperations().to_complement_code(8))
+        self.assertEqual(records[1]["result"], -15)
+        self.assertEqual(records[2]["result"], 4.0)
+        self.assertIn("error", records[3])
+        self.assertIn("error", records[4])
+
+    def test_run_operations_is_lazy(self):
+        records = run_operations(iter(["add 1 2", "add x y"]))
+        self.assertEqual(next(records)["result"], 3)
+        self.assertIn("error", next(records))
+
+    def test_write_jsonl(self):
+        out = io.StringIO()
+        write_jsonl(run_operations(["sub 3 5", "add 1 1"]), out)
+        lines = out.getvalue().splitlines()
+        self.assertEqual([json.loads(line)["result"] for line in lines], [-2, 2])
+
+    def test_write_jsonl_non_finite(self):
+        out = io.StringIO()
+        write_jsonl(run_operations(["fadd 1e39 1", "fadd nan 1"]), out)
+        strict = lambda token: self.fail(f"Недопустимая в JSON константа {token}")
+        records = [json.loads(line, parse_constant=strict) for line in out.getvalue().splitlines()]
+        self.assertEqual([r["result"] for r in records], ["inf", "nan"])
+
+    def test_division_errors(self):
+        records = list(run_operations(["div 99999999999 1", "mul 99999999999 2", "div " + "9" * 400 + " 1"]))
+        self.assertTrue(all("error" in r for r in records))
+        with patch.object(NumberOperations, 'divide_direct_code', side_effect=OverflowError("переполнение")):
+            record, = run_operations(["div 1 3"])
+        self.assertEqual(record["error"], "переполнение")
+
+
+class TestSweep(unittest.TestCase):
+    def test_binary_to_decimal_batch(self):
+        batch = BatchNumberOperations()
+        ops = NumberOperations()
+        codes = [ops.to_complement_code(n) for n in (0, 5, -5, -(2 ** 31))]
+        self.assertEqual(list(batch.binary_to_decimal(codes)), [0, 5, -5, -(2 ** 31)])
+
+    def test_check_chunk_boundaries(self):
+        last = (1 << 20) - 1
+        for check in ('complement', 'binary_to_decimal', 'ieee754'):
+            for index in (0, 1 << 19, (1 << 19) - 1, last):
+                self.assertEqual(check_chunk((check, 12, index))[1], 0)
+
+    def test_scalar_cross_check(self):
+        """Расхождение со скалярной реализацией находится и сообщается входными словами"""
+        with patch.object(NumberOperations, 'to_complement_code', return_value='0' * 32):
+            _, count, sample = check_chunk(('complement', 12, 1))
+        self.assertGreater(count, 0)
+        self.assertTrue(all(4096 <= word < 8192 for word in sample))
+        broken = lambda self, code: int(code, 2)
+        with patch.object(NumberOperations, 'binary_to_decimal', broken):
+            _, count, sample = check_chunk(('binary_to_decimal', 12, (1 << 20) - 1))
+        self.assertGreater(count, 0)
+        self.assertTrue(all(word >= 0xFFFFF000 for word in sample))
+        with patch.object(IEEE754Codec, 'encode', return_value=0):
+            self.assertGreater(check_chunk(('ieee754', 12, 1 << 18))[1], 0)
+
+    def test_resume_from_checkpoint(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'sweep.json')
+            out = io.StringIO()
+            state = run_sweep('ieee754', 16, 1, path, first=32767, last=32769, out=out)
+            self.assertEqual(sorted(state["done"]), [32767, 32768])
+            state = run_sweep('ieee754', 16, 1, path, first=32767, last=32770, out=out)
+            self.assertEqual(sorted(state["done"]), [32767, 32768, 32769])
+            self.assertEqual(state["mismatch_count"], 0)
+            self.assertIn("уже проверено 2", out.getvalue())
+
+
+class TestPackedLanes(unittest.TestCase):
+    def setUp(self):
+        rnd = random.Random(8)
+        self.a = [rnd.randint(-128, 127) for _ in range(50)] + [127, -128, -128]
+        self.b = [rnd.randint(-128, 127) for _ in range(50)] + [1, -1, 0]
+        self.engine = TwosComplement(8)
+
+    def expected(self, operation):
+        results = [getattr(self.engine, operation)(self.engine.encode(x), self.engine.encode(y))
+                   for x, y in zip(self.a, self.b)]
+        return [self.engine.decode(r[0]) for r in results], [i for i, r in enumerate(results) if r[2]]
+
+    def test_big_int_lanes(self):
+        lanes = PackedLanes(8, len(self.a))
+        x, y = lanes.pack(self.a), lanes.pack(self.b)
+        for operation in ('add', 'subtract'):
+            result, overflow = getattr(lanes, operation)(x, y)
+            values, overflowed = self.expected(operation)
+            self.assertEqual(lanes.unpack(result), values)
+            self.assertEqual(lanes.overflow_lanes(overflow), overflowed)
+        result, overflow = lanes.negate(x)
+        self.assertEqual(lanes.unpack(result), [self.engine.decode(-v & 0xFF) for v in self.a])
+        self.assertEqual(lanes.overflow_lanes(overflow), [51, 52])
+
+    def test_numpy_words(self):
+        lanes = PackedLanes(8, 8)
+        x, y = lanes.pack_array(self.a), lanes.pack_array(self.b)
+        self.assertEqual(x.shape, (7,))
+        result, overflow = lanes.add(x, y)
+        values, overflowed = self.expected('add')
+        self.assertEqual(list(lanes.unpack_array(result, len(self.a))), values)
+        self.assertEqual(list(np.flatnonzero(lanes.overflow_lanes(overflow))), overflowed)
+
+    def test_range_checks(self):
+        with self.assertRaises(ValueError):
+            PackedLanes(8, 2).pack([1, 2, 3])
+        with self.assertRaises(ValueError):
+            PackedLanes(4, 4).pack([8])
+        with self.assertRaises(ValueError):
+            PackedLanes(8, 4).pack_array([1])
+
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
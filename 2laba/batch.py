@@ -0,0 +1,98 @@
+import argparse
+import os
+import sys
+from itertools import islice
+from multiprocessing import Pool
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'common'))
+
+from cache import ExpressionCache
+from jsonl import write_jsonl
+from truthtable import TruthTable
+
+# Выражения с большим числом переменных дают слишком длинные формы для JSON
+MAX_VARIABLES = 16
+
+# Кэш выражений процесса-исполнителя, создаётся в init_worker
+_cache = None
+
+
+def init_worker(cache_size):
+    global _cache
+    _cache = ExpressionCache(cache_size) if cache_size else None
+
+
+def read_expressions(lines):
+    """Генератор (номер строки, выражение); пустые строки и комментарии '#' пропускаются"""
+    for number, line in enumerate(lines, 1):
+        expression = line.strip()
+        if expression and not expression.startswith('#'):
+            yield number, expression
+
+
+def analyze_expression(task):
+    """Разбор выражения и построение его форм; ошибки возвращаются как запись с полем error"""
+    number, expression, max_variables = task
+    record = {"line": number, "expression": expression}
+    try:
+        tt = TruthTable(expression, _cache)
+        if max_variables is not None and len(tt.variables) > max_variables:
+            raise ValueError(f"Слишком много переменных: {len(tt.variables)} (не больше {max_variables})")
+        record["variables"] = tt.variables
+        record.update(tt.normal_forms())
+    except (ValueError, RecursionError) as e:
+        # Одно неразборчивое выражение не должно обрывать весь прогон пула
+        record["error"] = str(e)
+    return record
+
+
+def run_expressions(lines, workers=None, chunksize=64, max_variables=MAX_VARIABLES, cache_size=4096):
+    """Параллельный конвейер: строки входа -> записи с результатами в порядке входа.
+
+    Задачи отправляются пулу окнами по chunksize * workers * 4 выражений,
+    поэтому вход читается лениво и в памяти держится только одно окно.
+    У каждого процесса свой кэш на cache_size выражений (0 - без кэша).
+    """
+    workers = workers or os.cpu_count() or 1
+    window = chunksize * workers * 4
+    tasks = ((number, expression, max_variables) for number, expression in read_expressions(lines))
+    with Pool(workers, init_worker, (cache_size,)) as pool:
+        while True:
+            batch = list(islice(tasks, window))
+            if not batch:
+                break
+            yield from pool.imap(analyze_expression, batch, chunksize)
+
+
+def run_batch(source='-', target='-', workers=None, chunksize=64, max_variables=MAX_VARIABLES, cache_size=4096):
+    infile = sys.stdin if source == '-' else open(source, encoding='utf-8')
+    outfile = sys.stdout if target == '-' else open(target, 'w', encoding='utf-8')
+    try:
+        write_jsonl(run_expressions(infile, workers, chunksize, max_variables, cache_size), outfile)
+    finally:
+        if infile is not sys.stdin:
+            infile.close()
+        if outfile is not sys.stdout:
+            outfile.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Пакетный анализ логических выражений: СДНФ, СКНФ и индексная форма")
+    parser.add_argument('source', nargs='?', default='-', metavar='ФАЙЛ',
+                        help="файл с выражениями, по одному в строке (по умолчанию stdin)")
+    parser.add_argument('-o', '--output', default='-', metavar='ФАЙЛ',
+                        help="файл для JSONL-результатов (по умолчанию stdout)")
+    parser.add_argument('-j', '--workers', type=int, default=None,
+                        help="число процессов (по умолчанию число ядер)")
+    parser.add_argument('--chunksize', type=int, default=64,
+                        help="выражений в одной задаче процесса")
+    parser.add_argument('--max-variables', type=int, default=MAX_VARIABLES,
+                        help="предел числа переменных в выражении")
+    parser.add_argument('--cache-size', type=int, default=4096,
+                        help="выражений в кэше каждого процесса (0 - без кэша)")
+    args = parser.parse_args(argv)
+    run_batch(args.source, args.output, args.workers, args.chunksize, args.max_variables, args.cache_size)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,294 @@
+from truthtable import TruthTable
+
+FALSE = 0
+TRUE = 1
+
+
+def order_variables(parsed):
+    """Порядок переменных по первому появлению при обходе выражения в глубину.
+
+    Переменные, стоящие рядом в формуле, обычно связаны одной операцией,
+    и при соседнем положении в порядке BDD получается заметно меньше.
+    """
+    order = []
+    seen = set()
+    visited = set()
+    stack = [parsed]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, str):
+            if node not in seen:
+                seen.add(node)
+                order.append(node)
+        elif id(node) not in visited:
+            visited.add(id(node))
+            # Потомки кладутся в обратном порядке, чтобы левый обходился первым
+            stack.extend(reversed(node[1:]))
+    return order
+
+
+class BDDManager:
+    """Хранилище узлов сокращённой упорядоченной диаграммы решений (ROBDD).
+
+    Узел - целое число: 0 и 1 - терминалы, остальные - индексы в массивах
+    уровня, низкого и высокого потомка. Таблица уникальности гарантирует,
+    что одинаковые функции представлены одним узлом, поэтому проверка
+    эквивалентности сводится к сравнению номеров. Результаты ITE кэшируются.
+    """
+
+    def __init__(self, variables=()):
+        self.variables = []
+        self.levels = {}
+        # Терминалы стоят ниже всех переменных
+        self._level = [None, None]
+        self._low = [FALSE, TRUE]
+        self._high = [FALSE, TRUE]
+        self._unique = {}
+        self._ite_cache = {}
+        self._restrict_cache = {}
+        for var in variables:
+            self.add_variable(var)
+
+    def add_variable(self, name):
+        """Добавление переменной в конец порядка; возвращает её уровень"""
+        if name not in self.levels:
+            self.levels[name] = len(self.variables)
+            self.variables.append(name)
+        return self.levels[name]
+
+    def level(self, node):
+        return len(self.variables) if node <= TRUE else self._level[node]
+
+    def __len__(self):
+        return len(self._level)
+
+    def make(self, level, low, high):
+        """Узел с проверкой на избыточность и повторное использование"""
+        if low == high:
+            return low
+        key = (level, low, high)
+        node = self._unique.get(key)
+        if node is None:
+            node = self._unique[key] = len(self._level)
+            self._level.append(level)
+            self._low.append(low)
+            self._high.append(high)
+        return node
+
+    def variable(self, name):
+        return self.make(self.add_variable(name), FALSE, TRUE)
+
+    def _cofactors(self, node, level):
+        if node > TRUE and self._level[node] == level:
+            return self._low[node], self._high[node]
+        return node, node
+
+    def ite(self, f, g, h):
+        """if f then g else h - универсальная операция над диаграммами"""
+        if f == TRUE:
+            return g
+        if f == FALSE:
+            return h
+        if g == h:
+            return g
+        if g == TRUE and h == FALSE:
+            return f
+        key = (f, g, h)
+        result = self._ite_cache.get(key)
+        if result is None:
+            top = min(self.level(f), self.level(g), self.level(h))
+            f0, f1 = self._cofactors(f, top)
+            g0, g1 = self._cofactors(g, top)
+            h0, h1 = self._cofactors(h, top)
+            result = self.make(top, self.ite(f0, g0, h0), self.ite(f1, g1, h1))
+            self._ite_cache[key] = result
+        return result
+
+    def negate(self, f):
+        return self.ite(f, FALSE, TRUE)
+
+    def apply(self, op, f, g):
+        if op == '&':
+            return self.ite(f, g, FALSE)
+        if op == '|':
+            return self.ite(f, TRUE, g)
+        if op == '->':
+            return self.ite(f, g, TRUE)
+        if op == '~':
+            return self.ite(f, g, self.negate(g))
+        raise ValueError(f"Неизвестный оператор: {op}")
+
+    def build(self, parsed):
+        """Диаграмма для разобранного выражения TruthTable.parsed.
+
+        Обход итеративный, общие подвыражения графа строятся один раз.
+        """
+        built = {}
+
+        def result_of(node):
+            return built.get(node if isinstance(node, str) else id(node))
+
+        stack = [parsed]
+        while stack:
+            node = stack[-1]
+            if result_of(node) is not None:
+                stack.pop()
+            elif isinstance(node, str):
+                stack.pop()
+                built[node] = self.variable(node)
+            else:
+                pending = [child for child in node[1:] if result_of(child) is None]
+                if pending:
+                    stack.extend(pending)
+                    continue
+                stack.pop()
+                operands = [result_of(child) for child in node[1:]]
+                if node[0] == '!':
+                    built[id(node)] = self.negate(operands[0])
+                else:
+                    built[id(node)] = self.apply(node[0], *operands)
+        return result_of(parsed)
+
+    def restrict(self, f, level, value):
+        """Кофактор f при фиксированном значении переменной уровня level"""
+        if f <= TRUE or self._level[f] > level:
+            return f
+        if self._level[f] == level:
+            return self._high[f] if value else self._low[f]
+        key = (f, level, value)
+        result = self._restrict_cache.get(key)
+        if result is None:
+            result = self.make(self._level[f],
+                               self.restrict(self._low[f], level, value),
+                               self.restrict(self._high[f], level, value))
+            self._restrict_cache[key] = result
+        return result
+
+    def satisfy_count(self, f, variables):
+        """Число наборов переменных variables (уровни менеджера), на которых f = 1"""
+        levels = sorted(self.levels[var] for var in variables)
+        position = {level: i for i, level in enumerate(levels)}
+        position[None] = len(levels)
+        memo = {FALSE: 0, TRUE: 1}
+
+        def place(node):
+            return position[self._level[node]] if node > TRUE else len(levels)
+
+        stack = [f]
+        while stack:
+            node = stack[-1]
+            if node in memo:
+                stack.pop()
+                continue
+            low, high = self._low[node], self._high[node]
+            pending = [child for child in (low, high) if child not in memo]
+            if pending:
+                stack.extend(pending)
+                continue
+            stack.pop()
+            here = place(node)
+            memo[node] = (memo[low] << (place(low) - here - 1)) + (memo[high] << (place(high) - here - 1))
+        return memo[f] << place(f)
+
+    def node_count(self, f):
+        """Число внутренних узлов диаграммы f"""
+        seen = set()
+        stack = [f]
+        while stack:
+            node = stack.pop()
+            if node > TRUE and node not in seen:
+                seen.add(node)
+                stack.extend((self._low[node], self._high[node]))
+        return len(seen)
+
+
+class BDD:
+    """Диаграмма решений выражения вместе с порядком переменных его таблицы.
+
+    Номера строк, минтермы и индексная форма считаются в порядке переменных
+    TruthTable (по алфавиту), независимо от порядка внутри диаграммы.
+    Все запросы работают за время, пропорциональное размеру диаграммы
+    (и размеру ответа, если он сам экспоненциален).
+    """
+
+    def __init__(self, expression, order=None, manager=None):
+        table = expression if isinstance(expression, TruthTable) else TruthTable(expression)
+        self.expression = table.original_expression
+        self.parsed = table.parsed
+        self.variables = table.variables
+        if manager is None:
+            if order is None:
+                order = order_variables(self.parsed)
+            elif order == 'table':
+                order = self.variables
+            missing = set(self.variables) - set(order)
+            if missing:
+                raise ValueError(f"В порядке переменных нет: {', '.join(sorted(missing))}")
+            manager = BDDManager(order)
+        self.manager = manager
+        self.root = manager.build(self.parsed)
+
+    def size(self):
+        return self.manager.node_count(self.root)
+
+    def count(self):
+        """Число наборов, на которых выражение истинно (длина СДНФ)"""
+        return self.manager.satisfy_count(self.root, self.variables)
+
+    def is_satisfiable(self):
+        return self.root != FALSE
+
+    def is_tautology(self):
+        return self.root == TRUE
+
+    def _table_levels(self):
+        return [self.manager.levels[var] for var in self.variables]
+
+    def minterms(self):
+        """Номера строк таблицы с единицей функции по возрастанию"""
+        levels = self._table_levels()
+        n = len(levels)
+        stack = [(self.root, 0, 0)]
+        while stack:
+            node, depth, prefix = stack.pop()
+            if node == FALSE:
+                continue
+            if node == TRUE:
+                start = prefix << (n - depth)
+                yield from range(start, start + (1 << (n - depth)))
+                continue
+            level = levels[depth]
+            # Сначала единичная ветвь кладётся в стек, чтобы нулевая вышла раньше
+            stack.append((self.manager.restrict(node, level, 1), depth + 1, prefix << 1 | 1))
+            stack.append((self.manager.restrict(node, level, 0), depth + 1, prefix << 1))
+
+    def truth_vector(self):
+        """Столбец значений одним целым (строка 0 - старший бит), как TruthTable.truth_vector"""
+        levels = self._table_levels()
+        n = len(levels)
+        memo = {}
+
+        def vector(node, depth):
+            if node <= TRUE:
+                return ((1 << (1 << (n - depth))) - 1) * node
+            key = (node, depth)
+            if key not in memo:
+                level = levels[depth]
+                low = vector(self.manager.restrict(node, level, 0), depth + 1)
+                high = vector(self.manager.restrict(node, level, 1), depth + 1)
+                memo[key] = (low << (1 << (n - depth - 1))) | high
+            return memo[key]
+
+        return vector(self.root, 0)
+
+    def index_form(self):
+        """Битовая строка индексной формы"""
+        return format(self.truth_vector(), f'0{1 << len(self.variables)}b')
+
+    def equivalent(self, other):
+        """Равносильность двух выражений (наборы переменных могут различаться)"""
+        if not isinstance(other, BDD):
+            other = BDD(other, manager=self.manager)
+        elif other.manager is not self.manager:
+            other = BDD(TruthTable(other.expression), manager=self.manager)
+        return self.root == other.root
@@ -0,0 +1,134 @@
+import json
+import os
+from collections import OrderedDict
+
+# Версия формата файла кэша; файл другой версии игнорируется
+CACHE_VERSION = 2
+
+
+def _flatten(parsed):
+    """Граф выражения -> список узлов, потомки раньше родителей, корень последним.
+
+    Переменная записывается строкой, операция - списком [оператор, номера
+    потомков...]. Общий узел попадает в список один раз, а вложенности нет,
+    поэтому глубина выражения не ограничивает ни json.dumps, ни json.loads.
+    """
+    def key(node):
+        return node if isinstance(node, str) else id(node)
+
+    index = {}
+    table = []
+    stack = [parsed]
+    while stack:
+        node = stack[-1]
+        if key(node) in index:
+            stack.pop()
+            continue
+        pending = [] if isinstance(node, str) else [child for child in node[1:] if key(child) not in index]
+        if pending:
+            stack.extend(pending)
+            continue
+        stack.pop()
+        index[key(node)] = len(table)
+        table.append(node if isinstance(node, str) else [node[0]] + [index[key(child)] for child in node[1:]])
+    return table
+
+
+def _unflatten(table):
+    """Обратное преобразование: список узлов -> граф из кортежей"""
+    nodes = []
+    for item in table:
+        if isinstance(item, str):
+            nodes.append(item)
+        else:
+            op, *children = item
+            if not isinstance(op, str) or not all(0 <= child < len(nodes) for child in children):
+                raise ValueError("Неверный узел в файле кэша")
+            nodes.append((op,) + tuple(nodes[child] for child in children))
+    return nodes[-1]
+
+
+class ExpressionCache:
+    """Ограниченный LRU-кэш разобранных выражений, общий для экземпляров TruthTable.
+
+    Ключ - нормализованное выражение, значение - словарь с переменными,
+    разобранным деревом и столбцом значений (vector, None пока не вычислен).
+    Скомпилированная функция тоже хранится, но только в памяти. При заданном
+    path кэш загружается из файла и сохраняется в него методом save().
+    """
+
+    def __init__(self, maxsize=1024, path=None):
+        if maxsize < 1:
+            raise ValueError("Размер кэша должен быть положительным")
+        self.maxsize = maxsize
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        if path is not None:
+            self.load()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, expression):
+        return expression in self._entries
+
+    def get(self, expression):
+        entry = self._entries.get(expression)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(expression)
+        return entry
+
+    def put(self, expression, variables, parsed):
+        """Новая запись; самая давно использованная вытесняется при переполнении"""
+        entry = {"variables": variables, "parsed": parsed, "vector": None, "compiled": None}
+        self._entries[expression] = entry
+        self._entries.move_to_end(expression)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+        return entry
+
+    def clear(self):
+        self._entries.clear()
+        self.hits = self.misses = 0
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._entries), "maxsize": self.maxsize}
+
+    def load(self, path=None):
+        """Загрузка записей из файла; отсутствующий или повреждённый файл пропускается.
+
+        Файл - обычный JSON, поэтому его содержимое только читается как
+        данные и не может выполнить код, даже если файл подменён.
+        """
+        path = path or self.path
+        try:
+            with open(path, encoding='utf-8') as f:
+                data = json.load(f)
+            if data["version"] != CACHE_VERSION:
+                return
+            entries = [(expression, variables, _unflatten(nodes), None if vector is None else int(vector, 16))
+                       for expression, variables, nodes, vector in data["entries"]]
+        except (OSError, ValueError, TypeError, KeyError, IndexError, AttributeError):
+            return
+        for expression, variables, parsed, vector in entries:
+            self.put(expression, variables, parsed)["vector"] = vector
+
+    def save(self, path=None):
+        """Атомарная запись кэша в файл (без скомпилированных функций)"""
+        path = path or self.path
+        if path is None:
+            raise ValueError("Не задан файл для сохранения кэша")
+        # Столбец значений хранится шестнадцатеричной строкой: длинные целые
+        # в JSON упираются в предел длины при обратном преобразовании в int
+        entries = [[expression, entry["variables"], _flatten(entry["parsed"]),
+                    None if entry["vector"] is None else format(entry["vector"], 'x')]
+                   for expression, entry in self._entries.items()]
+        temp = f"{path}.tmp"
+        with open(temp, 'w', encoding='utf-8') as f:
+            json.dump({"version": CACHE_VERSION, "entries": entries}, f, ensure_ascii=False)
+        os.replace(temp, path)
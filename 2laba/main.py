@@ -1,3 +1,7 @@
+import argparse
+import sys
+
+from render import FORMATS, render_forms, render_report, render_table
 from truthtable import TruthTable
 
 def main():
@@ -49,12 +53,13 @@ def main():
         print(f"Обнаружены переменные: {', '.join(tt.variables)}")
         print(f"Общее количество комбинаций: {2 ** len(tt.variables)}")
 
-        tt.build_table()
-        tt.build_sdnf_sknf()
+        render_table(tt, sys.stdout)
+        render_forms(tt, sys.stdout)
 
+        ones = bin(tt.truth_vector()).count('1')
         print("\nДополнительная информация:")
-        print(f"Количество единиц в функции: {sum(row[-1] for row in tt.rows)}")
-        print(f"Количество нулей в функции: {len(tt.rows) - sum(row[-1] for row in tt.rows)}")
+        print(f"Количество единиц в функции: {ones}")
+        print(f"Количество нулей в функции: {(1 << len(tt.variables)) - ones}")
 
     except ValueError as e:
         print(f"\nОшибка в выражении: {e}")
@@ -81,8 +86,8 @@ def test_all_examples():
         try:
             tt = TruthTable(expr)
             print(f"Переменные: {tt.variables}")
-            tt.build_table()
-            tt.build_sdnf_sknf()
+            render_table(tt, sys.stdout)
+            render_forms(tt, sys.stdout)
 
             # Проверка минимального/максимального количества переменных
             if len(tt.variables) < 3:
@@ -94,5 +99,68 @@ def test_all_examples():
                 print("!!! Этот тест должен был пройти успешно !!!")
 
 
+def _open_output(target, binary):
+    if target == '-':
+        return sys.stdout.buffer if binary else sys.stdout
+    return open(target, 'wb') if binary else open(target, 'w', encoding='utf-8')
+
+
+def run_expression(expression, fmt='text', target='-', forms=True, forms_target=None):
+    """Неинтерактивный вывод таблицы (и форм) одного выражения в выбранном формате.
+
+    В каждый поток пишется один документ: в json таблица и формы выводятся
+    одним объектом, а в csv - только таблица, потому что у форм другие
+    столбцы. Если задан forms_target, формы пишутся туда в том же формате,
+    а таблица - отдельно в target.
+    """
+    tt = TruthTable(expression)
+    binary = fmt == 'binary'
+    if binary and forms and forms_target is not None:
+        raise ValueError("Формат binary не поддерживается для нормальных форм")
+    outfile = _open_output(target, binary)
+    try:
+        if forms and forms_target is not None:
+            render_table(tt, outfile, fmt)
+            formsfile = _open_output(forms_target, False)
+            try:
+                render_forms(tt, formsfile, fmt)
+            finally:
+                if formsfile is not sys.stdout:
+                    formsfile.close()
+        elif forms and fmt == 'json':
+            render_report(tt, outfile)
+        else:
+            render_table(tt, outfile, fmt)
+            # Двоичный формат содержит только столбец значений
+            if forms and fmt == 'text':
+                render_forms(tt, outfile, fmt)
+    finally:
+        if outfile is not sys.stdout and outfile is not sys.stdout.buffer:
+            outfile.close()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Таблица истинности, СДНФ, СКНФ и индексная форма выражения")
+    parser.add_argument('expression', nargs='?', default=None,
+                        help="выражение; без него запускается интерактивный режим")
+    parser.add_argument('-f', '--format', choices=FORMATS, default='text',
+                        help="формат вывода (binary - только упакованный столбец значений)")
+    parser.add_argument('-o', '--output', default='-', metavar='ФАЙЛ',
+                        help="файл для результата (по умолчанию stdout)")
+    parser.add_argument('--no-forms', action='store_true',
+                        help="выводить только таблицу")
+    parser.add_argument('--forms-output', default=None, metavar='ФАЙЛ',
+                        help="файл для нормальных форм; для csv формы выводятся только так")
+    return parser.parse_args(argv)
+
+
 if __name__ == "__main__":
-    main()
+    args = parse_args()
+    if args.expression is not None:
+        try:
+            run_expression(args.expression, args.format, args.output, not args.no_forms, args.forms_output)
+        except ValueError as e:
+            print(f"Ошибка в выражении: {e}", file=sys.stderr)
+            sys.exit(1)
+    else:
+        main()
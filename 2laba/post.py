@@ -0,0 +1,92 @@
+POST_CLASSES = ('T0', 'T1', 'S', 'M', 'L')
+
+
+def _repeat(pattern, width, total):
+    """Повторение шаблона из width бит до total бит удвоением периода"""
+    while width < total:
+        pattern |= pattern << width
+        width *= 2
+    return pattern & ((1 << total) - 1)
+
+
+def _lane_flags(word, size, count):
+    """Строка из count символов: '1', если в дорожке из size бит есть единица.
+
+    Свёртка сдвигами собирает ИЛИ всех битов дорожки в её младший бит,
+    затем младшие биты читаются срезом строки с шагом size.
+    """
+    shift = 1
+    while shift < size:
+        word |= word >> shift
+        shift *= 2
+    return format(word, f'0{size * count}b')[size - 1::size]
+
+
+def classify_many(vectors, n):
+    """Классы Поста для многих функций от n переменных одним проходом.
+
+    vectors - столбцы значений (строка 0 - старший бит), как у
+    TruthTable.truth_vector. Все функции укладываются дорожками по 2^n бит
+    в одно целое, и каждая проверка - это n сдвигов с масками над всем
+    словом сразу. Возвращает список словарей {класс: bool} в порядке входа.
+    """
+    vectors = list(vectors)
+    if not vectors:
+        return []
+    size = 1 << n
+    total = size * len(vectors)
+    full = (1 << total) - 1
+    word = int("".join(format(v, f'0{size}b') for v in vectors), 2)
+    # Маска k: позиции, где в строке переменная с весом 2^k равна 1
+    masks = [_repeat((1 << (1 << k)) - 1, 2 << k, total) for k in range(n)]
+
+    # Монотонность: нет пары строк, отличающихся одной переменной, где 0 -> 1 даёт 1 -> 0
+    violations = 0
+    for k, mask in enumerate(masks):
+        violations |= (word >> (1 << k)) & ~word & mask
+
+    # Самодвойственность: столбец, прочитанный снизу вверх, равен инверсии столбца.
+    # Переворот внутри дорожек - обмен соседних блоков по 2^k бит
+    reversed_word = word
+    for k, mask in enumerate(masks):
+        step = 1 << k
+        reversed_word = ((reversed_word >> step) & mask) | ((reversed_word & mask) << step)
+    not_dual = reversed_word ^ word ^ full
+
+    # Линейность: в полиноме Жегалкина нет мономов степени 2 и выше
+    anf = word
+    for k, mask in enumerate(masks):
+        anf ^= (anf >> (1 << k)) & mask
+    linear_rows = (1 << (size - 1)) | sum(1 << (size - 1 - (1 << k)) for k in range(n))
+    nonlinear = anf & _repeat(((1 << size) - 1) ^ linear_rows, size, total)
+
+    bits = format(word, f'0{total}b')
+    first, last = bits[0::size], bits[size - 1::size]
+    monotone = _lane_flags(violations, size, len(vectors))
+    dual = _lane_flags(not_dual, size, len(vectors))
+    linear = _lane_flags(nonlinear, size, len(vectors))
+    return [{'T0': first[i] == '0', 'T1': last[i] == '1', 'S': dual[i] == '0',
+             'M': monotone[i] == '0', 'L': linear[i] == '0'}
+            for i in range(len(vectors))]
+
+
+def classify(vector, n):
+    """Классы Поста одной функции"""
+    return classify_many([vector], n)[0]
+
+
+def classify_tables(tables):
+    """Классы Поста для списка TruthTable; функции группируются по числу переменных"""
+    groups = {}
+    for i, tt in enumerate(tables):
+        groups.setdefault(len(tt.variables), []).append(i)
+    results = [None] * len(tables)
+    for n, indices in groups.items():
+        for i, classes in zip(indices, classify_many((tables[i].truth_vector() for i in indices), n)):
+            results[i] = classes
+    return results
+
+
+def is_complete(classes):
+    """Критерий Поста: система полна, если для каждого класса есть функция вне его"""
+    return all(not all(c[name] for c in classes) for name in POST_CLASSES)
@@ -0,0 +1,233 @@
+import csv
+import io
+import json
+import struct
+
+FORMATS = ('text', 'csv', 'json', 'binary')
+# Сколько символов (байт) накапливается перед одной записью в поток
+BUFFER_SIZE = 1 << 16
+# Двоичный формат: сигнатура, число переменных, имена, затем столбец значений
+BINARY_MAGIC = b'TTB2'
+
+
+class BufferedWriter:
+    """Накопление фрагментов и запись их в поток крупными порциями"""
+
+    def __init__(self, stream, size=BUFFER_SIZE):
+        self.stream = stream
+        self.size = size
+        self._parts = []
+        self._length = 0
+
+    def write(self, part):
+        self._parts.append(part)
+        self._length += len(part)
+        if self._length >= self.size:
+            self.flush()
+
+    def flush(self):
+        if self._parts:
+            empty = b'' if isinstance(self._parts[0], bytes) else ''
+            self.stream.write(empty.join(self._parts))
+            self._parts.clear()
+            self._length = 0
+
+
+def _row_lines(tt, cells, separator, chunk_bits):
+    """Строки таблицы без переменных на каждую ячейку.
+
+    Части строк для младших переменных блока строятся один раз, к ним
+    добавляются постоянная в блоке часть старших переменных и значение функции.
+    """
+    n = len(tt.variables)
+    low = min(chunk_bits, n)
+    lows = [separator.join(cells[(i >> (low - 1 - j)) & 1] for j in range(low)) + separator
+            for i in range(1 << low)] if low else ['']
+    for start, count, bits in tt.iter_chunks(chunk_bits):
+        block = start >> low
+        prefix = "".join(cells[(block >> (n - low - 1 - j)) & 1] + separator for j in range(n - low))
+        for low_part, bit in zip(lows, format(bits, f'0{count}b')):
+            yield prefix + low_part + cells[bit == '1']
+
+
+def _table_text(tt, out, chunk_bits):
+    header = tt.variables + [tt.original_expression]
+    out.write(" | ".join(f"{var:^5}" for var in header) + "\n")
+    out.write("-" * (6 * len(header) - 2) + "\n")
+    for line in _row_lines(tt, (f"{'0':^5}", f"{'1':^5}"), " | ", chunk_bits):
+        out.write(line + "\n")
+
+
+def _table_csv(tt, out, chunk_bits):
+    header = io.StringIO()
+    csv.writer(header, lineterminator="\n").writerow(tt.variables + [tt.original_expression])
+    out.write(header.getvalue())
+    for line in _row_lines(tt, ('0', '1'), ',', chunk_bits):
+        out.write(line + "\n")
+
+
+def _table_json_fields(tt, out, chunk_bits):
+    out.write('"variables": ' + json.dumps(tt.variables, ensure_ascii=False)
+              + ', "expression": ' + json.dumps(tt.original_expression, ensure_ascii=False)
+              + ', "rows": [')
+    first = True
+    for line in _row_lines(tt, ('0', '1'), ', ', chunk_bits):
+        out.write(("[" if first else ", [") + line + "]")
+        first = False
+    out.write("]")
+
+
+def _table_json(tt, out, chunk_bits):
+    out.write("{")
+    _table_json_fields(tt, out, chunk_bits)
+    out.write("}\n")
+
+
+def _table_binary(tt, out, chunk_bits):
+    """Столбец значений по 8 строк в байте, строка 0 - старший бит первого байта"""
+    out.write(BINARY_MAGIC + struct.pack('>H', len(tt.variables)))
+    for var in tt.variables:
+        name = var.encode('utf-8')
+        out.write(struct.pack('>H', len(name)) + name)
+    # Блоки не короче 8 строк, чтобы каждый занимал целое число байт
+    for _, count, bits in tt.iter_chunks(max(chunk_bits, 3)):
+        if count < 8:
+            bits, count = bits << (8 - count), 8
+        out.write(bits.to_bytes(count // 8, 'big'))
+
+
+TABLE_WRITERS = {
+    'text': _table_text,
+    'csv': _table_csv,
+    'json': _table_json,
+    'binary': _table_binary,
+}
+
+
+def render_table(tt, stream, fmt='text', chunk_bits=12):
+    """Запись таблицы истинности в поток в формате fmt.
+
+    Для 'binary' нужен двоичный поток, для остальных форматов - текстовый.
+    Строки вычисляются блоками и пишутся через буфер, вся таблица в памяти
+    не собирается.
+    """
+    if fmt not in TABLE_WRITERS:
+        raise ValueError(f"Неизвестный формат: {fmt}")
+    out = BufferedWriter(stream)
+    TABLE_WRITERS[fmt](tt, out, chunk_bits)
+    out.flush()
+
+
+def read_binary(stream):
+    """Чтение двоичной таблицы: (переменные, столбец значений целым)"""
+    if stream.read(len(BINARY_MAGIC)) != BINARY_MAGIC:
+        raise ValueError("Неверная сигнатура двоичной таблицы")
+    n, = struct.unpack('>H', stream.read(2))
+    variables = []
+    for _ in range(n):
+        length, = struct.unpack('>H', stream.read(2))
+        variables.append(stream.read(length).decode('utf-8'))
+    size = 1 << n
+    data = stream.read(max(size // 8, 1))
+    if len(data) != max(size // 8, 1):
+        raise ValueError("Двоичная таблица обрезана")
+    vector = int.from_bytes(data, 'big')
+    return variables, vector >> 8 - size if size < 8 else vector
+
+
+def _joined(out, items, separator, empty):
+    written = False
+    for item in items:
+        if written:
+            out.write(separator)
+        out.write(item)
+        written = True
+    if not written:
+        out.write(empty)
+
+
+def _forms_text(tt, out, chunk_bits):
+    """СДНФ, СКНФ и индексная форма в прежнем текстовом виде.
+
+    Каждая часть выводится отдельным проходом по блокам таблицы, поэтому
+    списки конституент не хранятся.
+    """
+    for value, title, separator, empty in ((True, "Совершенная дизъюнктивная нормальная форма (СДНФ)", " | ", "0"),
+                                           (False, "Совершенная конъюнктивная нормальная форма (СКНФ)", " & ", "1")):
+        out.write(f"\n{title}:\n")
+        terms = (tt.constituent(index, value) for index in tt.iter_indices(value, chunk_bits))
+        _joined(out, terms, separator, empty)
+        out.write(f"\nЧисловая форма {'СДНФ' if value else 'СКНФ'}: [")
+        _joined(out, map(str, tt.iter_indices(value, chunk_bits)), ", ", "")
+        out.write("]\n")
+
+    out.write("\nИндексная форма:\nБитовая строка: ")
+    number = 0
+    for _, count, bits in tt.iter_chunks(chunk_bits):
+        out.write(format(bits, f'0{count}b'))
+        number = (number << count) | bits
+    out.write(f"\nДесятичное число: {number}\n")
+
+
+def _forms_csv(tt, out, chunk_bits):
+    """Строки 'форма,номер,конституента' и строка индексной формы"""
+    out.write("form,number,term\n")
+    for value, form in ((True, 'sdnf'), (False, 'sknf')):
+        for index in tt.iter_indices(value, chunk_bits):
+            out.write(f"{form},{index},{tt.constituent(index, value)}\n")
+    out.write("index,,")
+    for _, count, bits in tt.iter_chunks(chunk_bits):
+        out.write(format(bits, f'0{count}b'))
+    out.write("\n")
+
+
+def _forms_json_fields(tt, out, chunk_bits):
+    for value, form, separator, empty in ((True, 'sdnf', " | ", "0"), (False, 'sknf', " & ", "1")):
+        out.write(f', "{form}": "')
+        terms = (tt.constituent(index, value) for index in tt.iter_indices(value, chunk_bits))
+        _joined(out, terms, separator, empty)
+        out.write(f'", "{form}_numbers": [')
+        _joined(out, map(str, tt.iter_indices(value, chunk_bits)), ", ", "")
+        out.write(']')
+    out.write(', "index_form": "')
+    number = 0
+    for _, count, bits in tt.iter_chunks(chunk_bits):
+        out.write(format(bits, f'0{count}b'))
+        number = (number << count) | bits
+    out.write(f'", "index_number": {number}')
+
+
+def _forms_json(tt, out, chunk_bits):
+    out.write('{"variables": ' + json.dumps(tt.variables, ensure_ascii=False))
+    _forms_json_fields(tt, out, chunk_bits)
+    out.write("}\n")
+
+
+FORMS_WRITERS = {
+    'text': _forms_text,
+    'csv': _forms_csv,
+    'json': _forms_json,
+}
+
+
+def render_forms(tt, stream, fmt='text', chunk_bits=12):
+    """Запись СДНФ, СКНФ, их числовых форм и индексной формы в формате fmt"""
+    if fmt not in FORMS_WRITERS:
+        raise ValueError(f"Формат {fmt} не поддерживается для нормальных форм")
+    out = BufferedWriter(stream)
+    FORMS_WRITERS[fmt](tt, out, chunk_bits)
+    out.flush()
+
+
+def render_report(tt, stream, chunk_bits=12):
+    """Таблица и нормальные формы одним JSON-объектом.
+
+    Поля те же, что у render_table и render_forms в формате 'json', так
+    что вывод остаётся одним документом и читается json.load.
+    """
+    out = BufferedWriter(stream)
+    out.write("{")
+    _table_json_fields(tt, out, chunk_bits)
+    _forms_json_fields(tt, out, chunk_bits)
+    out.write("}\n")
+    out.flush()
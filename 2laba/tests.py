@@ -1,7 +1,19 @@
+import csv
+import json
+import os
+import subprocess
+import sys
+import tempfile
 import unittest
+from itertools import product
 from unittest.mock import patch
-from io import StringIO
+from io import BytesIO, StringIO
 from truthtable import *
+from bdd import BDD, order_variables
+from batch import analyze_expression, run_expressions, write_jsonl
+from cache import ExpressionCache
+from post import classify_many, classify_tables, is_complete
+from render import read_binary, render_forms, render_report, render_table
 
 
 class TestTruthTable(unittest.TestCase):
@@ -27,9 +39,9 @@ class TestTruthTable(unittest.TestCase):
         with self.assertRaises(ValueError):
             TruthTable("a & b)")
 
-        # Слишком много переменных
-        with self.assertRaises(ValueError):
-            TruthTable("a & b & c & d & e & f & g")
+        # Ограничения в 6 переменных больше нет
+        tt = TruthTable("a & b & c & d & e & f & g")
+        self.assertEqual(len(tt.variables), 7)
 
     def test_parse_expression(self):
         # Простые выражения
@@ -46,6 +58,27 @@ class TestTruthTable(unittest.TestCase):
         tt = TruthTable("(a | b) -> c")
         self.assertEqual(tt.parsed, ('->', ('|', 'a', 'b'), 'c'))
 
+    def test_parse_precedence(self):
+        self.assertEqual(TruthTable("a & b | c").parsed, ('|', ('&', 'a', 'b'), 'c'))
+        self.assertEqual(TruthTable("a | b & c").parsed, ('|', 'a', ('&', 'b', 'c')))
+        self.assertEqual(TruthTable("!a & b").parsed, ('&', ('!', 'a'), 'b'))
+        self.assertEqual(TruthTable("a -> b -> c").parsed, ('->', 'a', ('->', 'b', 'c')))
+        self.assertEqual(TruthTable("a ~ b ~ c").parsed, ('~', ('~', 'a', 'b'), 'c'))
+        self.assertEqual(TruthTable("a & b -> c ~ d").parsed, ('~', ('->', ('&', 'a', 'b'), 'c'), 'd'))
+
+    def test_parse_identifiers(self):
+        tt = TruthTable("x1 and not flag or x10")
+        self.assertEqual(tt.variables, ['flag', 'x1', 'x10'])
+        self.assertEqual(tt.parsed, ('|', ('&', 'x1', ('!', 'flag')), 'x10'))
+
+    def test_parse_errors(self):
+        with self.assertRaisesRegex(ValueError, "позиции 4"):
+            TruthTable("a & & b")
+        with self.assertRaisesRegex(ValueError, "позиции 2"):
+            TruthTable("a b")
+        with self.assertRaisesRegex(ValueError, "позиции 3"):
+            TruthTable("a & ")
+
     def test_evaluate(self):
         tt = TruthTable("a & b")
         self.assertEqual(tt._evaluate(tt.parsed, {'a': 1, 'b': 1}), 1)
@@ -61,25 +94,27 @@ class TestTruthTable(unittest.TestCase):
 
     def test_build_table(self):
         tt = TruthTable("a & b")
+        self.assertEqual(tt.build_table(), [[False, False, False], [False, True, False],
+                                            [True, False, False], [True, True, True]])
 
-        with patch('sys.stdout', new=StringIO()) as fake_out:
-            tt.build_table()
-            output = fake_out.getvalue()
+        out = StringIO()
+        render_table(tt, out)
+        output = out.getvalue()
 
-            # Проверяем заголовок
-            self.assertIn("  a   |   b   | a & b", output)
-            # Проверяем разделитель (теперь ожидаем правильную длину)
-            self.assertIn("----------------", output)
-            # Проверяем несколько строк таблицы
-            self.assertIn("  0   |   0   |   0  ", output)
-            self.assertIn("  1   |   1   |   1  ", output)
+        # Проверяем заголовок
+        self.assertIn("  a   |   b   | a & b", output)
+        # Проверяем разделитель (теперь ожидаем правильную длину)
+        self.assertIn("----------------", output)
+        # Проверяем несколько строк таблицы
+        self.assertIn("  0   |   0   |   0  ", output)
+        self.assertIn("  1   |   1   |   1  ", output)
 
     def test_build_sdnf_sknf(self):
         tt = TruthTable("a & b")
-        tt.build_table()
+        self.assertEqual(tt.build_sdnf_sknf(), tt.normal_forms())
 
         with patch('sys.stdout', new=StringIO()) as fake_out:
-            tt.build_sdnf_sknf()
+            render_forms(tt, sys.stdout)
             output = fake_out.getvalue()
 
             # Проверяем СДНФ
@@ -109,5 +144,383 @@ class TestTruthTable(unittest.TestCase):
         self.assertEqual(tt._evaluate(tt.parsed, {'a': 0, 'b': 1, 'c': 1, 'd': 1}), 1)
 
 
+    def test_truth_vector(self):
+        tt = TruthTable("a & b")
+        self.assertEqual(tt.truth_vector(), 0b0001)
+
+        tt = TruthTable("(a -> b) & (c ~ d)")
+        with patch('sys.stdout', new=StringIO()):
+            tt.build_table()
+        expected = "".join('1' if row[-1] else '0' for row in tt.rows)
+        self.assertEqual(format(tt.truth_vector(), '016b'), expected)
+
+    def test_truth_vector_many_variables(self):
+        names = "abcdefghijklmnopqrstu"
+        tt = TruthTable("&".join(names))
+        self.assertEqual(tt.truth_vector(), 1)
+        tt = TruthTable("|".join(names))
+        self.assertEqual(tt.truth_vector(), (1 << ((1 << 21) - 1)) - 1)
+
+
+    def test_compile(self):
+        tt = TruthTable("(a -> b) & (c ~ !d)")
+        function = tt.compile()
+        self.assertIs(tt.compile(), function)
+        for values in product([False, True], repeat=4):
+            expected = tt._evaluate(tt.parsed, dict(zip(tt.variables, values)))
+            self.assertEqual(function(*values), expected)
+
+
+    def test_shared_subexpressions(self):
+        tt = TruthTable("((a~b)&(c|!d)->(e&f)) | !((a~b)&(c|!d)->(e&f))")
+        left, right = tt.parsed[1], tt.parsed[2][1]
+        self.assertIs(left, right)
+        self.assertEqual(tt.parsed, ('|', left, ('!', left)))
+        # a, b, c, d, e, f, a~b, !d, c|!d, &, e&f, ->, !, |
+        self.assertEqual(len(tt._nodes), 14)
+        self.assertEqual(tt.truth_vector(), (1 << 64) - 1)
+
+    def test_long_chain(self):
+        tt = TruthTable(" ~ ".join(["(a & b)", "(c | !a)"] * 1000))
+        self.assertEqual(len(tt._nodes), 2005)
+        self.assertEqual(tt.truth_vector(), (1 << 8) - 1)
+
+
+    def test_iter_chunks(self):
+        tt = TruthTable("(a & b) -> (c ~ d)")
+        for chunk_bits in (0, 1, 2, 4, 12):
+            number, rows = 0, 0
+            for start, count, bits in tt.iter_chunks(chunk_bits):
+                self.assertEqual(start, rows)
+                number, rows = (number << count) | bits, rows + count
+            self.assertEqual(rows, 16)
+            self.assertEqual(number, tt.truth_vector())
+
+    def test_iter_rows(self):
+        tt = TruthTable("a | !b")
+        rows = list(tt.iter_rows(chunk_bits=1))
+        self.assertEqual(rows, [((False, False), True), ((False, True), False),
+                                ((True, False), True), ((True, True), True)])
+
+    def test_write_table_stream(self):
+        stream = StringIO()
+        TruthTable("a & b").write_table(stream, chunk_bits=1)
+        self.assertEqual(stream.getvalue().splitlines()[2:],
+                         ["  0   |   0   |   0  ", "  0   |   1   |   0  ",
+                          "  1   |   0   |   0  ", "  1   |   1   |   1  "])
+
+    def test_write_sdnf_sknf_stream(self):
+        stream = StringIO()
+        TruthTable("a | b").write_sdnf_sknf(stream, chunk_bits=1)
+        output = stream.getvalue()
+        self.assertIn("(!a&b) | (a&!b) | (a&b)", output)
+        self.assertIn("Числовая форма СДНФ: [1, 2, 3]", output)
+        self.assertIn("(a|b)\nЧисловая форма СКНФ: [0]", output)
+        self.assertIn("Битовая строка: 0111", output)
+        self.assertIn("Десятичное число: 7", output)
+
+
+    def test_tautology_and_satisfiability(self):
+        self.assertTrue(TruthTable("a | !a").is_tautology())
+        self.assertFalse(TruthTable("a -> b").is_tautology())
+        self.assertTrue(TruthTable("a -> b").is_satisfiable())
+        self.assertFalse(TruthTable("a & !a").is_satisfiable())
+        # Шире одного блока из 64 строк
+        self.assertTrue(TruthTable(" | ".join(f"x{i}" for i in range(8)) + " | !x0").is_tautology())
+        self.assertTrue(TruthTable(" & ".join(f"x{i}" for i in range(8))).is_satisfiable())
+
+    def test_find_model(self):
+        self.assertEqual(TruthTable("a & !b & c").find_model(), {'a': True, 'b': False, 'c': True})
+        self.assertIsNone(TruthTable("(a & b) & !(a | b)").find_model())
+        model = TruthTable(" & ".join(f"x{i}" for i in range(8))).find_model()
+        self.assertTrue(all(model.values()))
+
+    def test_equivalent(self):
+        self.assertTrue(TruthTable("a -> b").equivalent("!a | b"))
+        self.assertTrue(TruthTable("a ~ b").equivalent(TruthTable("(a & b) | (!a & !b)")))
+        self.assertFalse(TruthTable("a -> b").equivalent("b -> a"))
+        # Фиктивная переменная не влияет на равносильность
+        self.assertTrue(TruthTable("a").equivalent("a & (b | !b)"))
+        self.assertFalse(TruthTable("a").equivalent("a & b"))
+
+
+    def test_normal_forms(self):
+        forms = TruthTable("a & b").normal_forms()
+        self.assertEqual(forms["sdnf"], "(a&b)")
+        self.assertEqual(forms["sknf"], "(a|b) & (a|!b) & (!a|b)")
+        self.assertEqual(forms["sdnf_numbers"], [3])
+        self.assertEqual(forms["sknf_numbers"], [0, 1, 2])
+        self.assertEqual((forms["index_form"], forms["index_number"]), ("0001", 1))
+        self.assertEqual(TruthTable("a & !a").normal_forms()["sdnf"], "0")
+
+
+    def test_build_zhegalkin(self):
+        self.assertEqual(TruthTable("a ~ b").build_zhegalkin(), [(), ('b',), ('a',)])
+        self.assertEqual(TruthTable("a | b").build_zhegalkin(), [('b',), ('a',), ('a', 'b')])
+        self.assertEqual(TruthTable("a -> b").build_zhegalkin(), [(), ('a',), ('a', 'b')])
+        self.assertEqual(TruthTable("a & !a").build_zhegalkin(), [])
+        self.assertEqual(TruthTable("a | !a").build_zhegalkin(), [()])
+
+    def test_zhegalkin_matches_definition(self):
+        tt = TruthTable("((a~b)&(c|!d)->(e&f))")
+        n, vector = len(tt.variables), tt.truth_vector()
+        size = 1 << n
+        values = [(vector >> (size - 1 - i)) & 1 for i in range(size)]
+        expected = []
+        for subset in range(size):
+            coefficient = 0
+            for i in range(size):
+                if i & subset == i:
+                    coefficient ^= values[i]
+            if coefficient:
+                expected.append(tuple(var for j, var in enumerate(tt.variables) if (subset >> (n - 1 - j)) & 1))
+        self.assertEqual(tt.build_zhegalkin(), expected)
+
+    def test_zhegalkin_many_variables(self):
+        tt = TruthTable(" ~ ".join(f"x{i}" for i in range(20)))
+        # Каждая из 19 эквивалентностей добавляет 1: 1 ^ x0 ^ ... ^ x19
+        self.assertEqual(sorted(tt.build_zhegalkin()), [()] + sorted((var,) for var in tt.variables))
+
+
+
+class TestPostClasses(unittest.TestCase):
+    def test_known_functions(self):
+        self.assertEqual(TruthTable("a & b").post_classes(),
+                         {'T0': True, 'T1': True, 'S': False, 'M': True, 'L': False})
+        self.assertEqual(TruthTable("!a").post_classes(),
+                         {'T0': False, 'T1': False, 'S': True, 'M': False, 'L': True})
+        self.assertEqual(TruthTable("a ~ b").post_classes(),
+                         {'T0': False, 'T1': True, 'S': False, 'M': False, 'L': True})
+        # Медиана самодвойственна и монотонна
+        self.assertEqual(TruthTable("(a & b) | (a & c) | (b & c)").post_classes(),
+                         {'T0': True, 'T1': True, 'S': True, 'M': True, 'L': False})
+
+    def test_all_functions_of_three_variables(self):
+        classes = classify_many(range(256), 3)
+        counts = {name: sum(c[name] for c in classes) for name in classes[0]}
+        self.assertEqual(counts, {'T0': 128, 'T1': 128, 'S': 16, 'M': 20, 'L': 16})
+        for vector, c in zip(range(256), classes):
+            values = [(vector >> (7 - i)) & 1 for i in range(8)]
+            monotone = all(values[i] <= values[j] for i in range(8) for j in range(8) if i & j == i)
+            self.assertEqual(c['M'], monotone)
+            self.assertEqual(c['S'], all(values[i] != values[7 - i] for i in range(8)))
+
+    def test_classify_tables(self):
+        tables = [TruthTable("a & b"), TruthTable("!a"), TruthTable("a | b | c")]
+        self.assertEqual(classify_tables(tables), [tt.post_classes() for tt in tables])
+        self.assertTrue(is_complete(classify_tables([TruthTable("a & b"), TruthTable("!a")])))
+        self.assertFalse(is_complete(classify_tables([TruthTable("a & b"), TruthTable("a | b")])))
+
+
+
+class TestExpressionCache(unittest.TestCase):
+    def test_hits_and_misses(self):
+        cache = ExpressionCache(maxsize=8)
+        first = TruthTable("a & b", cache)
+        vector = first.truth_vector()
+        second = TruthTable(" a && b ", cache)
+        self.assertIs(second.parsed, first.parsed)
+        self.assertEqual(second.variables, ['a', 'b'])
+        self.assertEqual(second._vector, vector)
+        self.assertIs(second.compile(), first.compile())
+        self.assertEqual(cache.stats(), {"hits": 1, "misses": 1, "size": 1, "maxsize": 8})
+
+    def test_lru_eviction(self):
+        cache = ExpressionCache(maxsize=2)
+        for expr in ("a", "b", "a", "c"):
+            TruthTable(expr, cache)
+        self.assertIn("a", cache)
+        self.assertNotIn("b", cache)
+        self.assertEqual(len(cache), 2)
+
+    def test_invalid_expression_not_cached(self):
+        cache = ExpressionCache()
+        with self.assertRaises(ValueError):
+            TruthTable("a # b", cache)
+        self.assertEqual(len(cache), 0)
+
+    def test_persistence(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "expressions.cache")
+            cache = ExpressionCache(path=path)
+            TruthTable("(a | b) & !(a & b)", cache).truth_vector()
+            cache.save()
+            restored = ExpressionCache(path=path)
+            tt = TruthTable("(a | b) & !(a & b)", restored)
+            self.assertEqual(restored.hits, 1)
+            self.assertEqual(tt._vector, 0b0110)
+            self.assertEqual(tt.parsed, ('&', ('|', 'a', 'b'), ('!', ('&', 'a', 'b'))))
+            self.assertEqual(tt.truth_vector(), 0b0110)
+
+    def test_missing_or_corrupt_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "expressions.cache")
+            self.assertEqual(len(ExpressionCache(path=path)), 0)
+            for content in ('not json', '[]', '{"version": 2, "entries": [["a", ["a"], [["!", 5]], null]]}',
+                            '{"version": 2, "entries": [["a", ["a"], [], null]]}', '{"version": 1, "entries": []}'):
+                with open(path, 'w', encoding='utf-8') as f:
+                    f.write(content)
+                self.assertEqual(len(ExpressionCache(path=path)), 0)
+
+    def test_file_is_plain_json_with_shared_nodes(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "expressions.cache")
+            cache = ExpressionCache(path=path)
+            expression = "(a & b) | !(a & b) | " + " & ".join(["c"] * 1500)
+            TruthTable(expression, cache).truth_vector()
+            cache.save()
+            with open(path, encoding='utf-8') as f:
+                data = json.load(f)
+            nodes = data["entries"][0][2]
+            conjunction = ["&", nodes.index("a"), nodes.index("b")]
+            self.assertEqual(nodes.count(conjunction), 1)
+            self.assertEqual(nodes.count("c"), 1)
+            restored = TruthTable(expression, ExpressionCache(path=path))
+            self.assertIs(restored.parsed[1][1], restored.parsed[1][2][1])
+            self.assertEqual(restored.truth_vector(), TruthTable(expression).truth_vector())
+
+
+
+class TestRender(unittest.TestCase):
+    def test_chunked_text_matches_single_block(self):
+        tt = TruthTable("(a -> b) ~ (c | !d)")
+        expected = StringIO()
+        render_table(tt, expected)
+        for chunk_bits in (0, 1, 3):
+            out = StringIO()
+            render_table(tt, out, chunk_bits=chunk_bits)
+            self.assertEqual(out.getvalue(), expected.getvalue())
+
+    def test_csv(self):
+        out = StringIO()
+        render_table(TruthTable("a -> b"), out, 'csv')
+        self.assertEqual(out.getvalue(), "a,b,a -> b\n0,0,1\n0,1,1\n1,0,0\n1,1,1\n")
+
+    def test_json(self):
+        tt = TruthTable("a | !b")
+        out = StringIO()
+        render_table(tt, out, 'json', chunk_bits=1)
+        self.assertEqual(json.loads(out.getvalue())["rows"], [[0, 0, 1], [0, 1, 0], [1, 0, 1], [1, 1, 1]])
+        out = StringIO()
+        render_forms(tt, out, 'json')
+        forms = json.loads(out.getvalue())
+        del forms["variables"]
+        self.assertEqual(forms, tt.normal_forms())
+
+    def test_report(self):
+        tt = TruthTable("a | !b")
+        out = StringIO()
+        render_report(tt, out)
+        report = json.loads(out.getvalue())
+        self.assertEqual(report["rows"], [[0, 0, 1], [0, 1, 0], [1, 0, 1], [1, 1, 1]])
+        self.assertEqual(report["expression"], "a | !b")
+        del report["rows"], report["expression"], report["variables"]
+        self.assertEqual(report, tt.normal_forms())
+
+    def test_command_line_single_document(self):
+        script = os.path.join(os.path.dirname(os.path.abspath(__file__)), "main.py")
+
+        def run(*args):
+            result = subprocess.run([sys.executable, script, "a & b", *args],
+                                    capture_output=True, encoding='utf-8', check=True)
+            return result.stdout
+
+        report = json.loads(run("-f", "json"))
+        self.assertEqual((report["rows"][-1], report["sdnf"]), ([1, 1, 1], "(a&b)"))
+        rows = list(csv.reader(StringIO(run("-f", "csv"))))
+        self.assertEqual(rows[0], ["a", "b", "a & b"])
+        self.assertEqual({len(row) for row in rows}, {3})
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "forms.csv")
+            self.assertEqual(run("-f", "csv", "--forms-output", path).splitlines()[0], "a,b,a & b")
+            with open(path, encoding='utf-8') as f:
+                self.assertEqual(f.readline(), "form,number,term\n")
+
+    def test_binary_round_trip(self):
+        for expr in ("a", "a & b | c", "(x1 ~ x2) -> (x3 & !x4) | x5", "x" * 300 + " | b"):
+            tt = TruthTable(expr)
+            out = BytesIO()
+            render_table(tt, out, 'binary', chunk_bits=0)
+            out.seek(0)
+            self.assertEqual(read_binary(out), (tt.variables, tt.truth_vector()))
+        with self.assertRaises(ValueError):
+            read_binary(BytesIO(b"XXXX"))
+
+    def test_unknown_format(self):
+        with self.assertRaises(ValueError):
+            render_table(TruthTable("a"), StringIO(), 'xml')
+        with self.assertRaises(ValueError):
+            render_forms(TruthTable("a"), BytesIO(), 'binary')
+
+
+
+class TestBDD(unittest.TestCase):
+    def test_matches_truth_table(self):
+        for expr in ["((a~b)&(c|!d)->(e&f))", "(!((a&b)|(!(c->(d~e)))))", "a & !a", "a | !a"]:
+            tt = TruthTable(expr)
+            vector, size = tt.truth_vector(), 1 << len(tt.variables)
+            for order in (None, 'table'):
+                bdd = BDD(expr, order)
+                self.assertEqual(bdd.truth_vector(), vector)
+                self.assertEqual(bdd.index_form(), format(vector, f'0{size}b'))
+                self.assertEqual(bdd.count(), bin(vector).count('1'))
+                self.assertEqual(list(bdd.minterms()),
+                                 [i for i in range(size) if (vector >> (size - 1 - i)) & 1])
+
+    def test_equivalent(self):
+        self.assertTrue(BDD("a -> b").equivalent("!a | b"))
+        self.assertFalse(BDD("a -> b").equivalent("b -> a"))
+        self.assertTrue(BDD("a").equivalent("a & (b | !b)"))
+        self.assertTrue(BDD("a ~ b").equivalent(BDD("(a & b) | (!a & !b)")))
+
+    def test_constants(self):
+        self.assertTrue(BDD("a | !a").is_tautology())
+        self.assertFalse(BDD("a & !a").is_satisfiable())
+        self.assertEqual(BDD("a & !a").size(), 0)
+
+    def test_many_variables(self):
+        expr = " | ".join(f"(x{i}&y{i})" for i in range(60))
+        self.assertEqual(order_variables(TruthTable(expr).parsed)[:4], ['x0', 'y0', 'x1', 'y1'])
+        bdd = BDD(expr)
+        self.assertEqual(bdd.size(), 120)
+        self.assertEqual(bdd.count(), (1 << 120) - 3 ** 60)
+        # Наименьший номер строки: x9 и y9 - последние в алфавитном порядке своих групп
+        self.assertEqual(next(bdd.minterms()), (1 << 60) | 1)
+
+
+
+class TestBatch(unittest.TestCase):
+    def test_analyze_expression(self):
+        record = analyze_expression((7, "a | b", 16))
+        self.assertEqual(record["line"], 7)
+        self.assertEqual(record["variables"], ['a', 'b'])
+        self.assertEqual(record["index_form"], "0111")
+        self.assertIn("error", analyze_expression((1, "a # b", 16)))
+        self.assertIn("error", analyze_expression((1, "a & b & c", 2)))
+
+    def test_run_expressions_keeps_order(self):
+        lines = ["# комментарий", ""] + [f"x{i} -> y" for i in range(40)] + ["(a"]
+        records = list(run_expressions(lines, workers=2, chunksize=3))
+        self.assertEqual([r["line"] for r in records], list(range(3, 44)))
+        self.assertEqual(records[5]["expression"], "x5 -> y")
+        self.assertEqual(records[5]["sdnf_numbers"], [0, 1, 3])
+        self.assertIn("error", records[-1])
+
+    def test_deep_nesting(self):
+        lines = ["!" * 3001 + "a", "(" * 1200 + "a & b" + ")" * 1200,
+                 "&(".join(["a", "b"] * 150) + ")" * 299]
+        records = list(run_expressions(lines, workers=1))
+        self.assertEqual(records[0]["index_form"], "10")
+        self.assertEqual(records[1]["index_form"], "0001")
+        self.assertEqual(records[2]["index_form"], "0001")
+        with patch.object(TruthTable, 'normal_forms', side_effect=RecursionError("глубоко")):
+            self.assertEqual(analyze_expression((1, "a", 16))["error"], "глубоко")
+
+    def test_write_jsonl(self):
+        out = StringIO()
+        write_jsonl([{"line": 1}, {"line": 2, "error": "ошибка"}], out)
+        self.assertEqual(out.getvalue(), '{"line": 1}\n{"line": 2, "error": "ошибка"}\n')
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -1,52 +1,50 @@
+import os
 import re
-from itertools import product
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'common'))
+
+from expression import compile_expression, extract_variables, normalize, parse
+from post import classify
+from render import render_forms, render_table
+
+# Строк в одном блоке потоковой обработки: 2^CHUNK_BITS
+CHUNK_BITS = 12
+# Блок проверок с ранним выходом: 64 строки
+CHECK_BITS = 6
+
 
 class TruthTable:
-    def __init__(self, expression):
+    def __init__(self, expression, cache=None):
         self.original_expression = expression
-        self.expression = self._normalize(expression)
-        self.variables = sorted(list(self._extract_variables()))
-        self.validate()
-        self.parsed = self._parse(self.expression)
+        self.expression = normalize(expression)
+        # Запись общего кэша ExpressionCache: разбор и столбец значений не повторяются
+        self._entry = cache.get(self.expression) if cache is not None else None
+        if self._entry is None:
+            self.variables = sorted(list(self._extract_variables()))
+            self.validate()
+            self.parsed = self._parse(self.expression)
+            if cache is not None:
+                self._entry = cache.put(self.expression, self.variables, self.parsed)
+        else:
+            self.variables = self._entry["variables"]
+            self.parsed = self._entry["parsed"]
         self.rows = []
-
-    def _normalize(self, expr):
-        return expr.replace(" ", "").replace("&&", "&").replace("||", "|")
+        self._vector = self._entry["vector"] if self._entry else None
+        self._compiled = self._entry["compiled"] if self._entry else None
+        self._anf = None
 
     def _extract_variables(self):
         """Извлекает все уникальные переменные из выражения, игнорируя операторы"""
-        variables = set()
-        i = 0
-        while i < len(self.expression):
-            c = self.expression[i]
-            if c.isalpha():
-                # Проверяем, не является ли это частью операторов and/or/not
-                if (c == 'a' and i + 2 < len(self.expression)
-                        and self.expression[i + 1:i + 3] == "nd"):
-                    i += 3
-                elif (c == 'o' and i + 1 < len(self.expression)
-                      and self.expression[i + 1] == "r"):
-                    i += 2
-                elif (c == 'n' and i + 2 < len(self.expression)
-                      and self.expression[i + 1:i + 3] == "ot"):
-                    i += 3
-                else:
-                    variables.add(c)
-                    i += 1
-            else:
-                i += 1
-        return variables
+        return extract_variables(self.expression)
 
     def validate(self):
         if not self.expression:
             raise ValueError("Пустое выражение")
 
-        if not re.fullmatch(r'[a-zA-Z&|!~()\->]+', self.expression):
+        if not re.fullmatch(r'[\sa-zA-Z0-9_&|!~()\->]+', self.expression):
             raise ValueError("Недопустимые символы в выражении")
 
-        if len(self.variables) > 6:
-            raise ValueError("Максимальное количество переменных - 6")
-
         balance = 0
         for c in self.expression:
             if c == '(':
@@ -59,46 +57,9 @@ class TruthTable:
             raise ValueError("Несбалансированные скобки")
 
     def _parse(self, expr):
-        while expr.startswith('(') and expr.endswith(')'):
-            if self._is_balanced(expr[1:-1]):
-                expr = expr[1:-1]
-            else:
-                break
-
-        if len(expr) == 1 and expr.isalpha():
-            return expr
-
-        if expr.startswith('!'):
-            return ('!', self._parse(expr[1:]))
-
-        bracket_count = 0
-        for i, c in enumerate(expr):
-            if c == '(':
-                bracket_count += 1
-            elif c == ')':
-                bracket_count -= 1
-            elif bracket_count == 0:
-                if c == '-' and i+1 < len(expr) and expr[i+1] == '>':
-                    return ('->', self._parse(expr[:i]), self._parse(expr[i+2:]))
-                elif c == '~':
-                    return ('~', self._parse(expr[:i]), self._parse(expr[i+1:]))
-                elif c == '|':
-                    return ('|', self._parse(expr[:i]), self._parse(expr[i+1:]))
-                elif c == '&':
-                    return ('&', self._parse(expr[:i]), self._parse(expr[i+1:]))
-
-        raise ValueError(f"Не удалось разобрать выражение: {expr}")
-
-    def _is_balanced(self, expr):
-        balance = 0
-        for c in expr:
-            if c == '(':
-                balance += 1
-            elif c == ')':
-                balance -= 1
-                if balance < 0:
-                    return False
-        return balance == 0
+        """Разбор в ациклический граф: self._nodes хранит все уникальные узлы"""
+        self._nodes = {}
+        return parse(expr, self._nodes)
 
     def _evaluate(self, parsed, values):
         if isinstance(parsed, str):
@@ -122,56 +83,213 @@ class TruthTable:
             return a == b
         raise ValueError(f"Неизвестный оператор: {parsed[0]}")
 
+    def _pattern_columns(self, count):
+        """Столбцы последних count переменных для блока из 2^count строк (строка 0 - старший бит)"""
+        size = 1 << count
+        columns = []
+        for j in range(count):
+            # Столбец переменной j - чередование серий из 2^(count-1-j) нулей и единиц,
+            # период удваивается сдвигом вместо деления длинных чисел
+            run = 1 << (count - 1 - j)
+            column, width = (1 << run) - 1, 2 * run
+            while width < size:
+                column |= column << width
+                width *= 2
+            columns.append(column)
+        return columns
+
+    def _variable_columns(self):
+        """Столбцы переменных таблицы как целые из 2^n бит (строка 0 - старший бит)"""
+        n = len(self.variables)
+        columns = dict(zip(self.variables, self._pattern_columns(n)))
+        return columns, (1 << (1 << n)) - 1
+
+    def compile(self):
+        """Компиляция выражения в функцию Python f(x0, ..., xn-1, _m=True), см. compile_expression"""
+        if self._compiled is None:
+            self._compiled = compile_expression(self.parsed, self.variables)
+            if self._entry is not None:
+                self._entry["compiled"] = self._compiled
+        return self._compiled
+
+    def truth_vector(self):
+        """Столбец значений функции одним целым; совпадает с индексной формой"""
+        if self._vector is None:
+            columns, full = self._variable_columns()
+            self._vector = self.compile()(*(columns[var] for var in self.variables), _m=full)
+            if self._entry is not None:
+                self._entry["vector"] = self._vector
+        return self._vector
+
+    def zhegalkin_vector(self):
+        """Коэффициенты полинома Жегалкина одним целым в раскладке столбца значений.
+
+        Бит строки i - коэффициент монома из переменных, равных 1 в наборе i.
+        Преобразование Мёбиуса выполняется на месте за n шагов: на шаге k
+        каждая строка, где переменная равна 1, складывается по модулю 2 со
+        строкой, где она равна 0. В раскладке "строка 0 - старший бит" пара
+        строк отстоит на 2^k позиций, а нужные строки - это столбец переменной.
+        """
+        if self._anf is None:
+            columns, _ = self._variable_columns()
+            anf = self.truth_vector()
+            for k, var in enumerate(reversed(self.variables)):
+                anf ^= (anf >> (1 << k)) & columns[var]
+            self._anf = anf
+        return self._anf
+
+    def build_zhegalkin(self):
+        """Полином Жегалкина как список мономов - кортежей переменных.
+
+        Пустой кортеж - свободный член 1, пустой список - константа 0.
+        Мономы идут в порядке номеров наборов.
+        """
+        n = len(self.variables)
+        bits = format(self.zhegalkin_vector(), f'0{1 << n}b')
+        # Моном собирается из двух заготовленных половин номера набора
+        half = n // 2
+
+        def parts(variables):
+            k = len(variables)
+            return [tuple(var for j, var in enumerate(variables) if (i >> (k - 1 - j)) & 1) for i in range(1 << k)]
+
+        high, low = parts(self.variables[:n - half]), parts(self.variables[n - half:])
+        low_mask = (1 << half) - 1
+        monomials = []
+        index = bits.find('1')
+        while index >= 0:
+            monomials.append(high[index >> half] + low[index & low_mask])
+            index = bits.find('1', index + 1)
+        return monomials
+
+    def post_classes(self):
+        """Принадлежность классам Поста: {'T0', 'T1', 'S', 'M', 'L': bool}"""
+        return classify(self.truth_vector(), len(self.variables))
+
+    def _blocks(self, variables, chunk_bits):
+        """Разбиение таблицы по переменным variables на блоки по 2^chunk_bits строк.
+
+        Выдаёт (номер первой строки, число строк, маска блока, столбцы переменных).
+        Младшие переменные задаются столбцами-шаблонами, старшие внутри
+        блока постоянны, поэтому память не зависит от размера таблицы.
+        """
+        n = len(variables)
+        low = min(chunk_bits, n)
+        count = 1 << low
+        full = (1 << count) - 1
+        patterns = self._pattern_columns(low)
+        for block in range(1 << (n - low)):
+            columns = {var: full if (block >> (n - low - 1 - j)) & 1 else 0
+                       for j, var in enumerate(variables[:n - low])}
+            columns.update(zip(variables[n - low:], patterns))
+            yield block * count, count, full, columns
+
+    def iter_chunks(self, chunk_bits=CHUNK_BITS):
+        """Ленивое вычисление таблицы блоками по 2^chunk_bits строк.
+
+        Выдаёт (номер первой строки, число строк, значения блока целым, строка 0
+        блока - старший бит).
+        """
+        function = self.compile()
+        for start, count, full, columns in self._blocks(self.variables, chunk_bits):
+            yield start, count, function(*(columns[var] for var in self.variables), _m=full)
+
+    def iter_rows(self, chunk_bits=CHUNK_BITS):
+        """Ленивый обход строк таблицы: (значения переменных, значение функции)"""
+        n = len(self.variables)
+        for start, count, bits in self.iter_chunks(chunk_bits):
+            for offset, bit in enumerate(format(bits, f'0{count}b')):
+                index = start + offset
+                yield tuple(bool((index >> (n - 1 - j)) & 1) for j in range(n)), bit == '1'
+
+    def iter_indices(self, value, chunk_bits=CHUNK_BITS):
+        """Номера строк, на которых функция равна value"""
+        digit = '1' if value else '0'
+        for start, count, bits in self.iter_chunks(chunk_bits):
+            for offset, bit in enumerate(format(bits, f'0{count}b')):
+                if bit == digit:
+                    yield start + offset
+
+    def constituent(self, index, conjunction):
+        """Конституента единицы (conjunction=True) или нуля для строки index"""
+        n = len(self.variables)
+        literals = []
+        for j, var in enumerate(self.variables):
+            bit = (index >> (n - 1 - j)) & 1
+            literals.append(var if bit == conjunction else '!' + var)
+        return "(" + ("&" if conjunction else "|").join(literals) + ")"
+
+    def normal_forms(self):
+        """СДНФ, СКНФ, их числовые формы и индексная форма одним словарём"""
+        vector = self.truth_vector()
+        bits = format(vector, f'0{1 << len(self.variables)}b')
+        sdnf_nums = [i for i, bit in enumerate(bits) if bit == '1']
+        sknf_nums = [i for i, bit in enumerate(bits) if bit == '0']
+        return {
+            "sdnf": " | ".join(self.constituent(i, True) for i in sdnf_nums) or "0",
+            "sknf": " & ".join(self.constituent(i, False) for i in sknf_nums) or "1",
+            "sdnf_numbers": sdnf_nums,
+            "sknf_numbers": sknf_nums,
+            "index_form": bits,
+            "index_number": vector,
+        }
+
+    def write_table(self, stream=None, fmt='text', chunk_bits=CHUNK_BITS):
+        """Потоковая запись таблицы истинности в файл или поток (по умолчанию stdout)"""
+        render_table(self, sys.stdout if stream is None else stream, fmt, chunk_bits)
+
+    def write_sdnf_sknf(self, stream=None, fmt='text', chunk_bits=CHUNK_BITS):
+        """Потоковая запись СДНФ, СКНФ, их числовых форм и индексной формы"""
+        render_forms(self, sys.stdout if stream is None else stream, fmt, chunk_bits)
+
+    def is_satisfiable(self, chunk_bits=CHECK_BITS):
+        return self.find_model(chunk_bits) is not None
+
+    def is_tautology(self, chunk_bits=CHECK_BITS):
+        """Проверка тождественной истинности с выходом на первом блоке с нулём"""
+        for _, count, bits in self.iter_chunks(chunk_bits):
+            if bits != (1 << count) - 1:
+                return False
+        return True
+
+    def find_model(self, chunk_bits=CHECK_BITS):
+        """Первый набор, на котором выражение истинно, как словарь {переменная: bool}.
+
+        Блоки вычисляются по 64 строки и перебор прекращается на первом
+        ненулевом; если наборов нет, возвращается None.
+        """
+        n = len(self.variables)
+        for start, count, bits in self.iter_chunks(chunk_bits):
+            if bits:
+                index = start + count - bits.bit_length()
+                return {var: bool((index >> (n - 1 - j)) & 1) for j, var in enumerate(self.variables)}
+        return None
+
+    def equivalent(self, other, chunk_bits=CHECK_BITS):
+        """Равносильность с другим выражением (строкой или TruthTable).
+
+        Обе функции вычисляются на общем наборе переменных блоками по 64
+        строки; сравнение прекращается на первом различающемся блоке.
+        """
+        if not isinstance(other, TruthTable):
+            other = TruthTable(other)
+        variables = sorted(set(self.variables) | set(other.variables))
+        first, second = self.compile(), other.compile()
+        for _, _, full, columns in self._blocks(variables, chunk_bits):
+            if (first(*(columns[var] for var in self.variables), _m=full)
+                    != second(*(columns[var] for var in other.variables), _m=full)):
+                return False
+        return True
+
     def build_table(self):
-        header = self.variables + [self.original_expression]
-        print(" | ".join(f"{var:^5}" for var in header))
-        print("-" * (6 * len(header) - 2))
+        """Строки таблицы [значения переменных..., значение функции] без вывода.
 
-        self.rows = []
-        for values in product([False, True], repeat=len(self.variables)):
-            value_dict = dict(zip(self.variables, values))
-            result = self._evaluate(self.parsed, value_dict)
-            row = list(values) + [result]
-            self.rows.append(row)
-            print(" | ".join(f"{str(int(val)):^5}" for val in row))
+        Для вывода служат write_table и модуль render.
+        """
+        self.rows = [list(values) + [result] for values, result in self.iter_rows()]
+        return self.rows
 
     def build_sdnf_sknf(self):
-        sdnf_terms = []
-        sknf_terms = []
-        sdnf_nums = []
-        sknf_nums = []
-        index_form = []
-
-        for i, row in enumerate(self.rows):
-            values, result = row[:-1], row[-1]
-            value_dict = dict(zip(self.variables, values))
-            index_form.append('1' if result else '0')
-
-            if result:
-                term = []
-                for var in self.variables:
-                    term.append(f"{var if value_dict[var] else '!'+var}")
-                sdnf_terms.append("(" + "&".join(term) + ")")
-                sdnf_nums.append(i)
-            else:
-                term = []
-                for var in self.variables:
-                    term.append(f"{var if not value_dict[var] else '!'+var}")
-                sknf_terms.append("(" + "|".join(term) + ")")
-                sknf_nums.append(i)
-
-        sdnf = " | ".join(sdnf_terms) if sdnf_terms else "0"
-        sknf = " & ".join(sknf_terms) if sknf_terms else "1"
-
-        print("\nСовершенная дизъюнктивная нормальная форма (СДНФ):")
-        print(sdnf)
-        print("Числовая форма СДНФ:", sdnf_nums)
-
-        print("\nСовершенная конъюнктивная нормальная форма (СКНФ):")
-        print(sknf)
-        print("Числовая форма СКНФ:", sknf_nums)
-
-        print("\nИндексная форма:")
-        print("Битовая строка:", "".join(index_form))
-        print("Десятичное число:", int("".join(index_form), 2))
+        """Нормальные формы как данные; для вывода служат write_sdnf_sknf и модуль render"""
+        return self.normal_forms()
         #((((a & b)~c)->(!d)) | c)
@@ -1,46 +1,47 @@
-from itertools import product, combinations
+from itertools import product
+import os
 import re
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'common'))
+
+from cover import COVER_TIME_LIMIT, minimum_cover
+from espresso import complement, espresso, from_positional, literal
+from expression import compile_expression, extract_variables, normalize, parse
+
+MAX_VARIABLES = 16
+
 
 class TruthTable:
-    def __init__(self, expression):
+    def __init__(self, expression, verbose=True, cover_time_limit=COVER_TIME_LIMIT, max_variables=MAX_VARIABLES):
         self.original_expression = expression
-        self.expression = self._normalize(expression)
+        # Табличные методы перебирают 2^n наборов; для minimize_*_espresso предел можно поднять
+        self.max_variables = max_variables
+        # verbose=False отключает пошаговый вывод склеиваний и таблиц покрытия
+        self.verbose = verbose
+        # Время на поиск минимального покрытия; при превышении - жадное покрытие
+        self.cover_time_limit = cover_time_limit
+        self.cover_exact = None
+        self.expression = normalize(expression)
         self.variables = sorted(list(self._extract_variables()))
         self.validate()
         self.parsed = self._parse(self.expression)
         self.rows = []
         self.sdnf_nums = []
         self.sknf_nums = []
-
-    def _normalize(self, expr):
-        return expr.replace(" ", "").replace("&&", "&").replace("||", "|")
+        self._compiled = None
 
     def _extract_variables(self):
-        variables = set()
-        i = 0
-        while i < len(self.expression):
-            c = self.expression[i]
-            if c.isalpha():
-                if (c == 'a' and i + 2 < len(self.expression) and self.expression[i + 1:i + 3] == "nd"):
-                    i += 3
-                elif (c == 'o' and i + 1 < len(self.expression) and self.expression[i + 1] == "r"):
-                    i += 2
-                elif (c == 'n' and i + 2 < len(self.expression) and self.expression[i + 1:i + 3] == "ot"):
-                    i += 3
-                else:
-                    variables.add(c)
-                    i += 1
-            else:
-                i += 1
-        return variables
+        """Извлекает все уникальные переменные из выражения, игнорируя операторы"""
+        return extract_variables(self.expression)
 
     def validate(self):
         if not self.expression:
             raise ValueError("Пустое выражение")
-        if not re.fullmatch(r'[a-zA-Z&|!~()\->]+', self.expression):
+        if not re.fullmatch(r'[\sa-zA-Z0-9_&|!~()\->]+', self.expression):
             raise ValueError("Недопустимые символы в выражении")
-        if len(self.variables) > 6:
-            raise ValueError("Максимальное количество переменных - 6")
+        if len(self.variables) > self.max_variables:
+            raise ValueError(f"Максимальное количество переменных - {self.max_variables}")
         balance = 0
         for c in self.expression:
             if c == '(':
@@ -53,42 +54,7 @@ class TruthTable:
             raise ValueError("Несбалансированные скобки")
 
     def _parse(self, expr):
-        while expr.startswith('(') and expr.endswith(')'):
-            if self._is_balanced(expr[1:-1]):
-                expr = expr[1:-1]
-            else:
-                break
-        if len(expr) == 1 and expr.isalpha():
-            return expr
-        if expr.startswith('!'):
-            return ('!', self._parse(expr[1:]))
-        bracket_count = 0
-        for i, c in enumerate(expr):
-            if c == '(':
-                bracket_count += 1
-            elif c == ')':
-                bracket_count -= 1
-            elif bracket_count == 0:
-                if c == '-' and i + 1 < len(expr) and expr[i + 1] == '>':
-                    return ('->', self._parse(expr[:i]), self._parse(expr[i + 2:]))
-                elif c == '~':
-                    return ('~', self._parse(expr[:i]), self._parse(expr[i + 1:]))
-                elif c == '|':
-                    return ('|', self._parse(expr[:i]), self._parse(expr[i + 1:]))
-                elif c == '&':
-                    return ('&', self._parse(expr[:i]), self._parse(expr[i + 1:]))
-        raise ValueError(f"Не удалось разобрать выражение: {expr}")
-
-    def _is_balanced(self, expr):
-        balance = 0
-        for c in expr:
-            if c == '(':
-                balance += 1
-            elif c == ')':
-                balance -= 1
-                if balance < 0:
-                    return False
-        return balance == 0
+        return parse(expr)
 
     def _evaluate(self, parsed, values):
         if isinstance(parsed, str):
@@ -109,13 +75,35 @@ class TruthTable:
             return a == b
         raise ValueError(f"Неизвестный оператор: {parsed[0]}")
 
+    def compile(self):
+        """Компиляция выражения в функцию Python f(x0, ..., xn-1, _m=True), см. compile_expression"""
+        if self._compiled is None:
+            self._compiled = compile_expression(self.parsed, self.variables)
+        return self._compiled
+
+    def truth_vector(self):
+        """Столбец значений функции одним целым (строка 0 - старший бит).
+
+        Скомпилированная функция вызывается один раз для столбцов переменных
+        из 2^n бит, а не для каждой строки.
+        """
+        n = len(self.variables)
+        size = 1 << n
+        columns = []
+        for j in range(n):
+            # Столбец переменной j - чередование серий из 2^(n-1-j) нулей и единиц
+            run = 1 << (n - 1 - j)
+            column, width = (1 << run) - 1, 2 * run
+            while width < size:
+                column |= column << width
+                width *= 2
+            columns.append(column)
+        return self.compile()(*columns, _m=(1 << size) - 1)
+
     def build_table(self):
-        self.rows = []
-        for values in product([False, True], repeat=len(self.variables)):
-            value_dict = dict(zip(self.variables, values))
-            result = self._evaluate(self.parsed, value_dict)
-            row = list(values) + [result]
-            self.rows.append(row)
+        bits = format(self.truth_vector(), f'0{1 << len(self.variables)}b')
+        self.rows = [list(values) + [bit == '1']
+                     for values, bit in zip(product([False, True], repeat=len(self.variables)), bits)]
 
     def build_sdnf_sknf(self):
         self.build_table()
@@ -146,53 +134,72 @@ class TruthTable:
         print("Числовая форма СКНФ:", self.sknf_nums)
         return sdnf, sknf
 
-    def _can_glue(self, a, b):
-        diff = [i for i in range(len(a)) if a[i] != b[i]]
-        return len(diff) == 1, diff[0] if len(diff) == 1 else None
+    def _glue(self, a, bit):
+        """Склейка куба (значение, маска) с соседом по разряду bit"""
+        return a[0] & ~bit, a[1] | bit
 
-    def _glue(self, a, b, pos):
-        return a[:pos] + 'X' + a[pos + 1:]
+    def _literals(self, cube):
+        """Пары (переменная, бит) для разрядов куба, не вычеркнутых маской"""
+        value, mask = cube
+        n = len(self.variables)
+        for i, var in enumerate(self.variables):
+            bit = 1 << (n - 1 - i)
+            if not mask & bit:
+                yield var, bool(value & bit)
 
     def _to_term(self, imp):
-        term = []
-        for i, c in enumerate(imp):
-            if c == '0':
-                term.append(f"!{self.variables[i]}")
-            elif c == '1':
-                term.append(self.variables[i])
-        return " & ".join(term) if term else ""
+        return " & ".join(var if bit else f"!{var}" for var, bit in self._literals(imp))
 
     def _to_cnf_term(self, imp):
-        term = []
-        for i, c in enumerate(imp):
-            if c == '0':
-                term.append(f"{self.variables[i]}")
-            elif c == '1':
-                term.append(f"!{self.variables[i]}")
-        return " | ".join(term) if term else ""
+        return " | ".join(f"!{var}" if bit else var for var, bit in self._literals(imp))
 
     def _get_initial_terms(self, term_nums, is_dnf=True):
-        terms_bin = [format(i, f'0{len(self.variables)}b') for i in term_nums]
-        if not terms_bin:
+        terms = [(i, 0) for i in term_nums]
+        if not terms:
             return None, "0" if is_dnf else "1"
-        print(f"Исходные {'минтермы' if is_dnf else 'макстермы'}:",
-              f" {' | ' if is_dnf else ' & '}".join(self._to_term(m) if is_dnf else f"({self._to_cnf_term(m)})"
-                                                    for m in terms_bin))
-        return terms_bin, None
+        if self.verbose:
+            print(f"Исходные {'минтермы' if is_dnf else 'макстермы'}:",
+                  f" {' | ' if is_dnf else ' & '}".join(self._to_term(m) if is_dnf else f"({self._to_cnf_term(m)})"
+                                                        for m in terms))
+        return terms, None
 
     def _glue_implicants(self, implicants, is_dnf=True):
+        """Один этап склеивания кубов (значение, маска).
+
+        Кубы раскладываются по корзинам (маска, число единиц): соседи по
+        одному разряду (XOR значений - одна единица) лежат только в соседних
+        корзинах и ищутся там по хешу. Новый вычеркнутый разряд ставится
+        только выше уже вычеркнутых, поэтому каждый куб следующего этапа
+        строится ровно один раз.
+        """
+        n = len(self.variables)
+        buckets = {}
+        for value, mask in implicants:
+            buckets.setdefault((mask, bin(value).count('1')), set()).add(value)
         new_implicants = set()
         used = set()
-        for a, b in combinations(implicants, 2):
-            can, pos = self._can_glue(a, b)
-            if can:
-                new_imp = self._glue(a, b, pos)
-                print(f"{'V' if is_dnf else '&'} "
-                      f"{' | '.join([self._to_term(a), self._to_term(b)]) if is_dnf else f'({self._to_cnf_term(a)}) & ({self._to_cnf_term(b)})'} "
-                      f"=> {' | '.join([self._to_term(new_imp)]) if is_dnf else f'({self._to_cnf_term(new_imp)})'}")
-                new_implicants.add(new_imp)
-                used.add(a)
-                used.add(b)
+        for (mask, ones), values in buckets.items():
+            lower = buckets.get((mask, ones - 1), ())
+            upper = buckets.get((mask, ones + 1), ())
+            if not lower and not upper:
+                continue
+            free = [1 << k for k in range(n) if not mask >> k & 1]
+            top = 1 << mask.bit_length()
+            for value in values:
+                for bit in free:
+                    if value & bit:
+                        if value ^ bit in lower:
+                            used.add((value, mask))
+                    elif value | bit in upper:
+                        used.add((value, mask))
+                        if bit >= top:
+                            a, b = (value, mask), (value | bit, mask)
+                            new_imp = self._glue(a, bit)
+                            if self.verbose:
+                                print(f"{'V' if is_dnf else '&'} "
+                                      f"{' | '.join([self._to_term(a), self._to_term(b)]) if is_dnf else f'({self._to_cnf_term(a)}) & ({self._to_cnf_term(b)})'} "
+                                      f"=> {' | '.join([self._to_term(new_imp)]) if is_dnf else f'({self._to_cnf_term(new_imp)})'}")
+                            new_implicants.add(new_imp)
         return new_implicants, used
 
     def _find_prime_implicants(self, terms_bin, is_dnf=True):
@@ -200,7 +207,8 @@ class TruthTable:
         prime_implicants = set()
         stage = 1
         while implicants:
-            print(f"\nЭтап склеивания {stage}:")
+            if self.verbose:
+                print(f"\nЭтап склеивания {stage}:")
             new_implicants, used = self._glue_implicants(implicants, is_dnf)
             prime_implicants.update(implicants - used)
             implicants = new_implicants
@@ -211,32 +219,28 @@ class TruthTable:
         return prime_implicants
 
     def _build_coverage(self, prime_implicants, terms_bin):
-        return {imp: [m for m in terms_bin if all(imp[i] == m[i] or imp[i] == 'X' for i in range(len(imp)))]
-                for imp in prime_implicants}
-
-    def _select_essential_implicants(self, coverage, terms_bin):
-        essential = []
-        covered = set()
-        for m in terms_bin:
-            covering = [imp for imp in coverage if m in coverage[imp]]
-            if len(covering) == 1 and covering[0] not in essential:
-                essential.append(covering[0])
-                covered.update(coverage[covering[0]])
-        return essential, covered
-
-    def _cover_remaining_terms(self, coverage, essential, covered, terms_bin):
-        remaining = set(terms_bin) - covered
-        if remaining:
-            non_essential = [imp for imp in coverage if imp not in essential]
-            while remaining:
-                candidates = [(imp, len([m for m in remaining if m in coverage[imp]])) for imp in non_essential]
-                if not candidates:
-                    break
-                best_imp = max(candidates, key=lambda x: x[1])[0]
-                essential.append(best_imp)
-                covered.update(coverage[best_imp])
-                remaining -= covered
-        return essential
+        """Строки таблицы покрытия: импликанта -> битовая маска покрываемых термов (бит i - terms_bin[i])"""
+        coverage = {}
+        for imp in sorted(prime_implicants, key=lambda imp: (-imp[1], imp[0])):
+            row = 0
+            for i, m in enumerate(terms_bin):
+                if m[0] & ~imp[1] == imp[0]:
+                    row |= 1 << i
+            coverage[imp] = row
+        return coverage
+
+    def _select_cover(self, coverage):
+        """Минимальный набор импликант: сначала меньше импликант, затем меньше литералов.
+
+        Точность результата сохраняется в self.cover_exact.
+        """
+        n = len(self.variables)
+        imps = list(coverage)
+        # Цена импликанты: число литералов плюс вес, превышающий литералы любого покрытия
+        weight = n * len(imps) + 1
+        costs = [weight + n - bin(imp[1]).count('1') for imp in imps]
+        chosen, self.cover_exact = minimum_cover([coverage[imp] for imp in imps], costs, self.cover_time_limit)
+        return [imps[i] for i in chosen]
 
     def minimize_dnf_calculation(self):
         print("\nМинимизация СДНФ расчетным методом:")
@@ -246,8 +250,7 @@ class TruthTable:
             return result
         prime_implicants = self._find_prime_implicants(terms_bin, is_dnf=True)
         coverage = self._build_coverage(prime_implicants, terms_bin)
-        essential, covered = self._select_essential_implicants(coverage, terms_bin)
-        essential = self._cover_remaining_terms(coverage, essential, covered, terms_bin)
+        essential = self._select_cover(coverage)
         result = " | ".join(self._to_term(imp) for imp in essential) if essential else "0"
 
         return result
@@ -260,19 +263,20 @@ class TruthTable:
             return result
         prime_implicants = self._find_prime_implicants(terms_bin, is_dnf=False)
         coverage = self._build_coverage(prime_implicants, terms_bin)
-        essential, covered = self._select_essential_implicants(coverage, terms_bin)
-        essential = self._cover_remaining_terms(coverage, essential, covered, terms_bin)
+        essential = self._select_cover(coverage)
         result = " & ".join(f"({self._to_cnf_term(imp)})" for imp in essential) if essential else "1"
 
         return result
 
     def _print_coverage_table(self, coverage, terms_bin, is_dnf=True):
+        if not self.verbose:
+            return
         print("\nТаблица покрытия:")
         header = [""] + [self._to_term(m) if is_dnf else f"({self._to_cnf_term(m)})" for m in terms_bin]
         print(" | ".join(f"{h:^15}" for h in header))
         for imp in coverage:
             row = [self._to_term(imp) if is_dnf else f"({self._to_cnf_term(imp)})"] + \
-                  ["x" if m in coverage[imp] else " " for m in terms_bin]
+                  ["x" if coverage[imp] >> i & 1 else " " for i in range(len(terms_bin))]
             print(" | ".join(f"{c:^15}" for c in row))
 
     def minimize_dnf_table(self):
@@ -284,8 +288,7 @@ class TruthTable:
         prime_implicants = self._find_prime_implicants(terms_bin, is_dnf=True)
         coverage = self._build_coverage(prime_implicants, terms_bin)
         self._print_coverage_table(coverage, terms_bin, is_dnf=True)
-        essential, covered = self._select_essential_implicants(coverage, terms_bin)
-        essential = self._cover_remaining_terms(coverage, essential, covered, terms_bin)
+        essential = self._select_cover(coverage)
         result = " | ".join(self._to_term(imp) for imp in essential) if essential else "0"
 
         return result
@@ -299,12 +302,108 @@ class TruthTable:
         prime_implicants = self._find_prime_implicants(terms_bin, is_dnf=False)
         coverage = self._build_coverage(prime_implicants, terms_bin)
         self._print_coverage_table(coverage, terms_bin, is_dnf=False)
-        essential, covered = self._select_essential_implicants(coverage, terms_bin)
-        essential = self._cover_remaining_terms(coverage, essential, covered, terms_bin)
+        essential = self._select_cover(coverage)
         result = " & ".join(f"({self._to_cnf_term(imp)})" for imp in essential) if essential else "1"
 
         return result
 
+    def _cube_cover(self, parsed, positions, full, value=True):
+        """Покрытия кубами (позиционная запись) наборов, где выражение равно value и not value.
+
+        Для &, | и -> одна полярность узла - объединение покрытий потомков
+        (истина для | и ->, ложь для &), вторая - дополнение этого
+        объединения по Шеннону; произведения покрытий не раскрываются.
+        Обход итеративный, каждая пара (узел, значение) вычисляется один
+        раз. Второе покрытие возвращается, только если оно получилось по
+        пути (иначе None): тогда оно обычно и есть короткое объединение.
+        """
+        covers = {}
+        easy = {'&': False, '|': True, '->': True}
+
+        def key(node, node_value):
+            return (node if isinstance(node, str) else id(node)), node_value
+
+        def requests(node, node_value):
+            if isinstance(node, str):
+                return []
+            if node[0] == '!':
+                return [(node[1], not node_value)]
+            if node[0] not in easy and node[0] != '~':
+                raise ValueError(f"Неизвестный оператор: {node[0]}")
+            a, b = node[1], node[2]
+            if node[0] == '~':
+                return [(a, False), (b, False), (a, True), (b, True)]
+            if node_value != easy[node[0]]:
+                return [(node, easy[node[0]])]
+            if node[0] == '&':
+                return [(a, False), (b, False)]
+            if node[0] == '|':
+                return [(a, True), (b, True)]
+            return [(a, False), (b, True)]
+
+        def union(*parts):
+            return [cube for part in parts for cube in covers[key(*part)]]
+
+        stack = [(parsed, value)]
+        while stack:
+            node, node_value = stack[-1]
+            if key(node, node_value) in covers:
+                stack.pop()
+                continue
+            pending = [part for part in requests(node, node_value) if key(*part) not in covers]
+            if pending:
+                stack.extend(pending)
+                continue
+            stack.pop()
+            if isinstance(node, str):
+                cover = literal(positions[node], node_value, full)
+            elif node[0] == '!':
+                cover = covers[key(node[1], not node_value)]
+            elif node[0] == '~':
+                a, b = node[1], node[2]
+                # Равенство: обе ложны или обе истинны; неравенство - ровно одна истинна
+                if node_value:
+                    cover = complement(union((a, False), (b, False)), full) + complement(union((a, True), (b, True)), full)
+                else:
+                    cover = complement(union((a, False), (b, True)), full) + complement(union((a, True), (b, False)), full)
+            elif node_value != easy[node[0]]:
+                cover = complement(covers[key(node, easy[node[0]])], full)
+            else:
+                cover = union(*requests(node, node_value))
+            covers[key(node, node_value)] = cover
+        return covers[key(parsed, value)], covers.get(key(parsed, not value))
+
+    def _espresso(self, is_dnf=True):
+        """Кубы минимальной ДНФ функции (is_dnf) или её отрицания (для КНФ)"""
+        n = len(self.variables)
+        full = (1 << n) - 1
+        positions = {var: 1 << (n - 1 - i) for i, var in enumerate(self.variables)}
+        on_cover, off_cover = self._cube_cover(self.parsed, positions, full, is_dnf)
+        on_set = [from_positional(c) for c in on_cover]
+        # Готовое OFF-множество ускоряет расширение, если оно не больше ON-множества
+        off_set = [from_positional(c) for c in off_cover] if off_cover is not None and len(off_cover) < len(on_cover) else None
+        cubes = espresso(on_set, n=n, off_set=off_set)
+        if self.verbose:
+            print(f"Кубов в исходном покрытии: {len(on_set)}, после Espresso: {len(cubes)}")
+        return cubes
+
+    def minimize_dnf_espresso(self):
+        print("\nМинимизация СДНФ эвристическим методом Espresso:")
+        cubes = self._espresso(is_dnf=True)
+        if not cubes:
+            print("СДНФ = 0, минимизация невозможна")
+            return "0"
+        return " | ".join(self._to_term(cube) or "1" for cube in cubes)
+
+    def minimize_cnf_espresso(self):
+        print("\nМинимизация СКНФ эвристическим методом Espresso:")
+        cubes = self._espresso(is_dnf=False)
+        if not cubes:
+            print("СКНФ = 1, минимизация невозможна")
+            return "1"
+        clauses = [self._to_cnf_term(cube) for cube in cubes]
+        return " & ".join(f"({clause})" for clause in clauses) if all(clauses) else "0"
+
     def _init_karnaugh_map(self, term_nums, value='1'):
         n = len(self.variables)
         if n > 5:
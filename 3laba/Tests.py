@@ -1,5 +1,9 @@
 import unittest
 from Karno import TruthTable
+from cover import greedy_cover, minimum_cover
+from espresso import cubes_from_strings, espresso
+from itertools import combinations
+import random
 import io
 from contextlib import redirect_stdout
 
@@ -90,7 +94,156 @@ class TestTruthTableFixed(unittest.TestCase):
             TruthTable("A&&&&B")  # Неправильный оператор
 
         with self.assertRaises(ValueError):
-            TruthTable("A|B|C|D|E|F|G")  # Слишком много переменных
+            TruthTable(" | ".join(f"x{i}" for i in range(17)))  # Слишком много переменных
+
+    def test_parse_precedence(self):
+        """Отрицание применяется к ближайшему операнду, & связывает сильнее |"""
+        tt = TruthTable(self.complex_expr)
+        self.assertEqual(tt.parsed, ('|', ('!', ('~', 'A', 'B')), ('->', 'C', 'D')))
+        self.assertEqual(TruthTable("A|B&C").parsed, ('|', 'A', ('&', 'B', 'C')))
+
+    def test_compile(self):
+        """Скомпилированная функция совпадает с обходом дерева"""
+        tt = TruthTable(self.complex_expr)
+        function = tt.compile()
+        self.assertIs(tt.compile(), function)
+        tt.build_table()
+        for row in tt.rows:
+            values = dict(zip(tt.variables, row[:-1]))
+            self.assertEqual(row[-1], tt._evaluate(tt.parsed, values))
+
+    def test_compile_long_chain(self):
+        """Длинная цепочка операций компилируется без рекурсии"""
+        tt = TruthTable("&".join(["a", "b"] * 800), verbose=False)
+        self.assertEqual(tt.truth_vector(), 0b0001)
+
+    def test_prime_implicants_cubes(self):
+        """Простые импликанты как кубы (значение, маска) совпадают с известными"""
+        tt = TruthTable("(A&B)|(A&C)|(B&C)", verbose=False)
+        tt.build_sdnf_sknf()
+        terms, _ = tt._get_initial_terms(tt.sdnf_nums)
+        self.assertEqual(terms, [(3, 0), (5, 0), (6, 0), (7, 0)])
+        # A&B = 11X, A&C = 1X1, B&C = X11
+        self.assertEqual(tt._find_prime_implicants(terms), {(6, 1), (5, 2), (3, 4)})
+        self.assertEqual(tt._to_term((6, 1)), "A & B")
+        self.assertEqual(tt._to_cnf_term((0, 4)), "B | C")
+
+    def test_glue_stages(self):
+        """Каждый куб следующего этапа строится один раз, вывод шагов сохраняется"""
+        tt = TruthTable("A|B")
+        with io.StringIO() as buf, redirect_stdout(buf):
+            new, used = tt._glue_implicants({(1, 0), (2, 0), (3, 0)})
+            output = buf.getvalue()
+        self.assertEqual(new, {(1, 2), (2, 1)})
+        self.assertEqual(used, {(1, 0), (2, 0), (3, 0)})
+        self.assertIn("=> B", output)
+        self.assertIn("=> A", output)
+
+    def test_many_variables(self):
+        """Минимизация функции от 12 переменных даёт равносильную ДНФ"""
+        terms = [f"x{i} & x{i + 1} & !x{i + 2} & x{i + 3}" for i in (10, 14, 18)]
+        expr = " | ".join(f"({term})" for term in terms)
+        tt = TruthTable(expr, verbose=False)
+        with io.StringIO() as buf, redirect_stdout(buf):
+            tt.build_sdnf_sknf()
+            result = tt.minimize_dnf_calculation()
+        self.assertEqual(sorted(result.split(" | ")), sorted(terms))
+
+
+    def test_minimum_cover_cyclic(self):
+        """Циклическая таблица покрытия: жадный выбор даёт 4 импликанты, точный - 3"""
+        expr = "(!a&!b&!c)|(!a&!b&c)|(!a&b&!c)|(a&!b&c)|(a&b&!c)|(a&b&c)"
+        tt = TruthTable(expr, verbose=False)
+        with io.StringIO() as buf, redirect_stdout(buf):
+            tt.build_sdnf_sknf()
+            result = tt.minimize_dnf_calculation()
+        self.assertTrue(tt.cover_exact)
+        self.assertEqual(len(result.split(" | ")), 3)
+
+        tt = TruthTable(expr, verbose=False, cover_time_limit=0)
+        with io.StringIO() as buf, redirect_stdout(buf):
+            tt.build_sdnf_sknf()
+            result = tt.minimize_dnf_calculation()
+        self.assertFalse(tt.cover_exact)
+        self.assertEqual(len(result.split(" | ")), 4)
+
+    def test_minimum_cover_exact(self):
+        """Точное покрытие совпадает с полным перебором"""
+        def union(selected):
+            covered = 0
+            for row in selected:
+                covered |= row
+            return covered
+
+        rng = random.Random(11)
+        for _ in range(100):
+            rows = [rng.getrandbits(10) for _ in range(rng.randint(1, 8))]
+            costs = [rng.randint(1, 4) for _ in rows]
+            universe = union(rows)
+            best = min(sum(costs[i] for i in chosen)
+                       for k in range(len(rows) + 1) for chosen in combinations(range(len(rows)), k)
+                       if union(rows[i] for i in chosen) == universe)
+            chosen, exact = minimum_cover(rows, costs)
+            self.assertTrue(exact)
+            self.assertEqual(union(rows[i] for i in chosen), universe)
+            self.assertEqual(sum(costs[i] for i in chosen), best)
+            greedy = greedy_cover(dict(enumerate(rows)), costs, universe)
+            self.assertEqual(union(rows[i] for i in greedy), universe)
+
+    def test_espresso_matches_table(self):
+        """Espresso даёт равносильные ДНФ и КНФ не длиннее точной минимизации"""
+        for expr in ("(a|b)->c", "!(a~b)|(c->d)", "(a&b)|(!a&c)|(b&c)", "!((!d ~ e) & ((d -> e) ~ f))"):
+            tt = TruthTable(expr, verbose=False)
+            with io.StringIO() as buf, redirect_stdout(buf):
+                tt.build_sdnf_sknf()
+                dnf = tt.minimize_dnf_espresso()
+                cnf = tt.minimize_cnf_espresso()
+                exact = tt.minimize_dnf_calculation()
+            for result in (dnf, cnf):
+                parsed = tt._parse(result)
+                for row in tt.rows:
+                    self.assertEqual(tt._evaluate(parsed, dict(zip(tt.variables, row[:-1]))), row[-1])
+            self.assertLessEqual(len(dnf.split(" | ")), len(exact.split(" | ")))
+
+    def test_espresso_cubes(self):
+        """Кубы ON- и DC-множеств задаются напрямую строками"""
+        on_set, n = cubes_from_strings(["0-1", "1-1"])
+        self.assertEqual(espresso(on_set, n=n), [(0b001, 0b110)])
+        on_set, n = cubes_from_strings(["001"])
+        dc_set, _ = cubes_from_strings(["011", "1X1"])
+        self.assertEqual(espresso(on_set, dc_set, n), [(0b001, 0b110)])
+        self.assertEqual(espresso([], n=3), [])
+        with self.assertRaises(ValueError):
+            cubes_from_strings(["01", "0-1"])
+
+    def test_espresso_many_variables(self):
+        """24 переменные: без перебора наборов, предел табличных методов поднимается явно"""
+        pairs = [(f"x{i}", f"x{i + 1}") for i in range(0, 24, 3)]
+        expr = " | ".join(f"({a} & {b} & x{int(b[1:]) + 1}) | ({a} & {b} & !x{int(b[1:]) + 1})"
+                          for a, b in pairs)
+        with self.assertRaises(ValueError):
+            TruthTable(expr, verbose=False)
+        tt = TruthTable(expr, verbose=False, max_variables=30)
+        with io.StringIO() as buf, redirect_stdout(buf):
+            result = tt.minimize_dnf_espresso()
+        self.assertEqual(sorted(result.split(" | ")), sorted(" & ".join(sorted(pair)) for pair in pairs))
+
+    def test_espresso_cnf_many_variables(self):
+        """КНФ и ДНФ от 22 переменных: ON- и OFF-покрытия строятся без раскрытия произведений"""
+        n = 22
+        rng = random.Random(3)
+        terms = [rng.sample(range(n), 4) for _ in range(12)]
+        literals = [[("!" if rng.random() < 0.5 else "") + f"x{i}" for i in term] for term in terms]
+        dnf = " | ".join("(" + " & ".join(term) + ")" for term in literals)
+        cnf = " & ".join("(" + " | ".join(term) + ")" for term in literals)
+        for expr, method in ((dnf, "minimize_cnf_espresso"), (cnf, "minimize_dnf_espresso")):
+            tt = TruthTable(expr, verbose=False, max_variables=30)
+            with io.StringIO() as buf, redirect_stdout(buf):
+                result = getattr(tt, method)()
+            check = TruthTable(f"({result}) ~ ({expr})", verbose=False, max_variables=30)
+            self.assertGreaterEqual(len(check.variables), 20)
+            self.assertEqual(check.truth_vector(), (1 << (1 << len(check.variables))) - 1)
+
 
 
 def test_edge_cases(self):
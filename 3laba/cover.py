@@ -0,0 +1,144 @@
+import time
+
+# Время на точный перебор по умолчанию, секунд
+COVER_TIME_LIMIT = 5.0
+
+
+class _Timeout(Exception):
+    pass
+
+
+def _columns(rows, uncovered):
+    """Для каждого непокрытого столбца - множество строк (битовая маска номеров)"""
+    columns = {}
+    for i, row in rows.items():
+        bits = row & uncovered
+        while bits:
+            low = bits & -bits
+            columns[low] = columns.get(low, 0) | (1 << i)
+            bits ^= low
+    return columns
+
+
+def _reduce(rows, costs, uncovered, chosen):
+    """Сокращение таблицы покрытия до неподвижной точки.
+
+    Существенные строки (единственные в своём столбце) выбираются сразу;
+    строка, столбцы которой входят в столбцы не более дорогой строки,
+    удаляется; столбец, строки которого включают строки другого столбца,
+    удаляется - покрыв второй, покроем и его. Возвращает оставшиеся
+    строки и столбцы либо None, если какой-то столбец покрыть нечем.
+    """
+    while True:
+        rows = {i: row & uncovered for i, row in rows.items() if row & uncovered}
+        if not uncovered:
+            return rows, uncovered
+        columns = _columns(rows, uncovered)
+        if len(columns) != bin(uncovered).count('1'):
+            return None
+        changed = False
+
+        for column, members in columns.items():
+            if members & (members - 1) == 0:
+                i = members.bit_length() - 1
+                if i in rows and column & uncovered:
+                    chosen.append(i)
+                    uncovered &= ~rows.pop(i)
+                    changed = True
+        if changed:
+            continue
+
+        order = sorted(rows, key=lambda i: (bin(rows[i]).count('1'), -costs[i]))
+        for pos, i in enumerate(order):
+            for j in order[pos + 1:]:
+                if j in rows and rows[i] & ~rows[j] == 0 and costs[i] >= costs[j]:
+                    del rows[i]
+                    changed = True
+                    break
+
+        kept = []
+        for column, members in sorted(columns.items(), key=lambda item: bin(item[1]).count('1')):
+            if any(other & ~members == 0 for other in kept):
+                uncovered &= ~column
+                changed = True
+            else:
+                kept.append(members)
+        if not changed:
+            return rows, uncovered
+
+
+def _lower_bound(rows, costs, uncovered):
+    """Нижняя граница: столбцы с попарно непересекающимися наборами строк
+    требуют разных строк, каждая не дешевле самой дешёвой из своего набора"""
+    bound = 0
+    taken = 0
+    columns = _columns(rows, uncovered)
+    for members in sorted(columns.values(), key=lambda m: bin(m).count('1')):
+        if not members & taken:
+            taken |= members
+            indices = [i for i in rows if members >> i & 1]
+            bound += min(costs[i] for i in indices)
+    return bound
+
+
+def greedy_cover(rows, costs, uncovered):
+    """Жадное покрытие: каждый раз строка с наибольшим числом новых столбцов на единицу цены"""
+    chosen = []
+    rows = dict(rows)
+    while uncovered:
+        best = max(rows, key=lambda i: (bin(rows[i] & uncovered).count('1') / costs[i], -i))
+        if not rows[best] & uncovered:
+            raise ValueError("Столбцы таблицы покрытия нельзя покрыть")
+        chosen.append(best)
+        uncovered &= ~rows.pop(best)
+    return chosen
+
+
+def minimum_cover(rows, costs=None, time_limit=COVER_TIME_LIMIT):
+    """Покрытие минимальной цены методом ветвей и границ.
+
+    rows - список битовых масок покрываемых столбцов (бит i - столбец i),
+    costs - цены строк (по умолчанию 1). Возвращает (номера выбранных строк,
+    точность): если перебор не уложился в time_limit секунд, возвращается
+    лучшее из найденных покрытий, не хуже жадного, и точность False.
+    """
+    costs = list(costs) if costs is not None else [1] * len(rows)
+    universe = 0
+    for row in rows:
+        universe |= row
+    deadline = None if time_limit is None else time.monotonic() + time_limit
+    start = {i: row for i, row in enumerate(rows)}
+    best = [greedy_cover(start, costs, universe)]
+    best_cost = [sum(costs[i] for i in best[0])]
+
+    def search(rows, uncovered, chosen):
+        if deadline is not None and time.monotonic() > deadline:
+            raise _Timeout
+        chosen = list(chosen)
+        reduced = _reduce(rows, costs, uncovered, chosen)
+        if reduced is None:
+            return
+        rows, uncovered = reduced
+        cost = sum(costs[i] for i in chosen)
+        if not uncovered:
+            if cost < best_cost[0]:
+                best[0], best_cost[0] = chosen, cost
+            return
+        if cost + _lower_bound(rows, costs, uncovered) >= best_cost[0]:
+            return
+        # Ветвление по самому трудному столбцу: одна из его строк обязательно входит в покрытие
+        columns = _columns(rows, uncovered)
+        column, members = min(columns.items(), key=lambda item: bin(item[1]).count('1'))
+        candidates = sorted((i for i in rows if members >> i & 1),
+                            key=lambda i: (costs[i] / bin(rows[i]).count('1'), i))
+        for i in candidates:
+            rest = {j: row for j, row in rows.items() if j != i}
+            search(rest, uncovered & ~rows[i], chosen + [i])
+            # Дальше столбец покрывается другими строками, строка i исключается
+            rows = rest
+
+    try:
+        search(start, universe, [])
+    except _Timeout:
+        return sorted(best[0]), False
+    return sorted(best[0]), True
@@ -0,0 +1,378 @@
+"""Эвристическая минимизация в духе Espresso: EXPAND / IRREDUNDANT / REDUCE.
+
+Снаружи кубы задаются как в Karno парами (значение, маска): бит маски -
+вычеркнутая переменная, переменная j занимает бит n-1-j. Внутри куб
+хранится в позиционной записи (ones, zeros): бит в ones - переменная может
+быть 1, бит в zeros - может быть 0; у вычеркнутой переменной стоят оба.
+Простые импликанты и минтермы не перечисляются: проверки сводятся к
+рекурсивному разложению покрытий по Шеннону, а дополнение покрытия
+(complement) строится тем же разложением со слиянием половин, без
+раскрытия произведений.
+"""
+
+
+def to_positional(cube, full):
+    value, mask = cube
+    return value | mask, (full & ~value) | mask
+
+
+def from_positional(cube):
+    ones, zeros = cube
+    return ones & ~zeros, ones & zeros
+
+
+def _bits(mask):
+    while mask:
+        low = mask & -mask
+        yield low
+        mask ^= low
+
+
+def _literals(cube, n):
+    return n - bin(cube[0] & cube[1]).count('1')
+
+
+def _literal_index(cover, full):
+    """Номера кубов покрытия, закрепляющих каждую переменную в 1 и в 0.
+
+    Множество номеров - целое, бит i которого соответствует cover[i], поэтому
+    поиск кубов с нужными литералами сводится к операциям над целыми.
+    """
+    fixed_one = dict.fromkeys(_bits(full), 0)
+    fixed_zero = dict.fromkeys(_bits(full), 0)
+    for i, (ones, zeros) in enumerate(cover):
+        flag = 1 << i
+        for bit in _bits(full & ~zeros):
+            fixed_one[bit] |= flag
+        for bit in _bits(full & ~ones):
+            fixed_zero[bit] |= flag
+    return fixed_one, fixed_zero
+
+
+def _intersecting(index, cube, full):
+    """Множество кубов, пересекающих cube: без литералов, противоположных его литералам"""
+    fixed_one, fixed_zero = index
+    blocked = 0
+    for bit in _bits(full & ~cube[1]):
+        blocked |= fixed_zero[bit]
+    for bit in _bits(full & ~cube[0]):
+        blocked |= fixed_one[bit]
+    return ~blocked
+
+
+def _contained(index, cube, full):
+    """Множество кубов внутри cube: со всеми его литералами (-1, если литералов нет)"""
+    fixed_one, fixed_zero = index
+    inside = -1
+    for bit in _bits(full & ~cube[1]):
+        inside &= fixed_one[bit]
+    for bit in _bits(full & ~cube[0]):
+        inside &= fixed_zero[bit]
+    return inside
+
+
+def _containing(index, cube, full):
+    """Множество кубов, содержащих cube: без литералов, которых нет у cube"""
+    fixed_one, fixed_zero = index
+    outside = 0
+    for bit in _bits(full & cube[1]):
+        outside |= fixed_one[bit]
+    for bit in _bits(full & cube[0]):
+        outside |= fixed_zero[bit]
+    return ~outside
+
+
+def _members(flags, cover):
+    """Кубы покрытия с номерами из множества flags"""
+    while flags:
+        low = flags & -flags
+        yield cover[low.bit_length() - 1]
+        flags ^= low
+
+
+def _single_cube_containment(cover, full):
+    cover = sorted(set(cover), key=lambda c: -bin(c[0] & c[1]).count('1'))
+    index = _literal_index(cover, full)
+    # Повторов нет, поэтому куб остаётся, только если содержит его лишь он сам
+    return [cube for i, cube in enumerate(cover) if _containing(index, cube, full) & ((1 << len(cover)) - 1) == 1 << i]
+
+
+def literal(bit, value, full):
+    """Покрытие из одного литерала: переменная разряда bit равна value"""
+    return [(full, full & ~bit) if value else (full & ~bit, full)]
+
+
+def _cofactor(cover, cube, full):
+    """Кофактор покрытия по кубу: закреплённые кубом переменные вычеркиваются"""
+    cube_ones, cube_zeros = cube
+    ones, zeros = full & ~cube_ones, full & ~cube_zeros
+    return [(a | ones, b | zeros) for a, b in cover if (a & cube_ones) | (b & cube_zeros) == full]
+
+
+def _split_variable(cover, full):
+    """Переменная для разложения: самая частая из бинатных, иначе из всех; None для констант"""
+    positive = negative = 0
+    for ones, zeros in cover:
+        positive |= full & ~zeros
+        negative |= full & ~ones
+    binate = positive & negative
+    candidates = binate or positive | negative
+    if not candidates:
+        return None, False
+    return _busiest_bit((full & ~(c[0] & c[1]) for c in cover), candidates), bool(binate)
+
+
+def _busiest_bit(masks, candidates):
+    """Разряд из candidates, установленный в наибольшем числе масок (при равенстве - старший).
+
+    Счётчики всех разрядов ведутся сразу, поразрядно-параллельно: plane[i] -
+    i-й двоичный разряд счётчиков, маска прибавляется как перенос.
+    """
+    planes = []
+    for mask in masks:
+        carry = mask & candidates
+        i = 0
+        while carry:
+            if i == len(planes):
+                planes.append(carry)
+                break
+            planes[i], carry = planes[i] ^ carry, planes[i] & carry
+            i += 1
+    # Разряды счётчиков от старшего сужают множество до разрядов с максимумом
+    best = candidates
+    for plane in reversed(planes):
+        if best & plane:
+            best &= plane
+    return 1 << (best.bit_length() - 1)
+
+
+def _literal_cofactor(cover, bit, value):
+    if value:
+        return [(c[0], c[1] | bit) for c in cover if c[0] & bit]
+    return [(c[0] | bit, c[1]) for c in cover if c[1] & bit]
+
+
+def tautology(cover, full):
+    """Покрытие тождественно истинно (метод унатной рекурсии)"""
+    while True:
+        if not cover:
+            return False
+        positive = negative = 0
+        for ones, zeros in cover:
+            if ones & zeros == full:
+                return True
+            positive |= full & ~zeros
+            negative |= full & ~ones
+        # Кубы с литералами унатных переменных не влияют на тавтологию и отбрасываются
+        unate = positive ^ negative
+        if not unate:
+            break
+        cover = [c for c in cover if not full & ~(c[0] & c[1]) & unate]
+    # Кубы вместе содержат меньше наборов, чем всё пространство
+    if sum(1 << (ones & zeros).bit_count() for ones, zeros in cover) < 1 << full.bit_count():
+        return False
+    bit = _busiest_bit((full & ~(c[0] & c[1]) for c in cover), positive)
+    return tautology(_literal_cofactor(cover, bit, 1), full) and tautology(_literal_cofactor(cover, bit, 0), full)
+
+
+def complement(cover, full):
+    """Дополнение покрытия рекурсивным разложением по Шеннону.
+
+    Дополнение куба строится по де Моргану (по кубу на литерал), ветви
+    разложения сливаются: куб, общий для обеих ветвей или поглощаемый
+    кубом другой ветви, теряет литерал переменной разложения.
+    """
+    if not cover:
+        return [(full, full)]
+    if (full, full) in cover:
+        return []
+    if len(cover) == 1:
+        ones, zeros = cover[0]
+        return [(full & ~bit, full) if ones & bit else (full, full & ~bit)
+                for bit in _bits(full & ~(ones & zeros))]
+    bit, _ = _split_variable(cover, full)
+    high = complement(_literal_cofactor(cover, bit, 1), full)
+    low = complement(_literal_cofactor(cover, bit, 0), full)
+    high_index, low_index = _literal_index(high, full), _literal_index(low, full)
+    high_all, low_all = (1 << len(high)) - 1, (1 << len(low)) - 1
+    result = []
+    for cube in high:
+        if _containing(low_index, cube, full) & low_all:
+            result.append(cube)
+        else:
+            result.append((cube[0], cube[1] & ~bit))
+    for cube in low:
+        if _containing(high_index, cube, full) & high_all:
+            result.append(cube)
+        else:
+            result.append((cube[0] & ~bit, cube[1]))
+    return _single_cube_containment(result, full)
+
+
+def _near(conflicts, raised):
+    """Кубы care, у которых вне raised не больше одного противоречия, по этому разряду (0 - нет)"""
+    near = {}
+    for conflict, cube in conflicts:
+        rest = conflict & ~raised
+        if not rest & (rest - 1):
+            near.setdefault(rest, []).append(cube)
+    return near
+
+
+def _expand(cover, care, n, full, off=None):
+    """Расширение каждого куба до простого, пока он остаётся внутри care (ON и DC).
+
+    Если известно OFF-множество off, вместо тавтологии проверяется, что
+    расширенный куб не пересекает ни одного его куба.
+    """
+    # Сколько кубов покрытия закрепляют переменную в 1 и в 0
+    ones_count = {bit: sum(1 for c in cover if not c[1] & bit) for bit in _bits(full)}
+    zeros_count = {bit: sum(1 for c in cover if not c[0] & bit) for bit in _bits(full)}
+    pending = sorted(cover, key=lambda c: _literals(c, n))
+    index = _literal_index(pending, full)
+    covered = 0
+    result = {}
+    for i, cube in enumerate(pending):
+        if covered >> i & 1:
+            continue
+        fixed = full & ~(cube[0] & cube[1])
+        # Сначала вычеркиваются переменные, противоположный литерал которых чаще в покрытии:
+        # расширенный куб тогда может поглотить больше кубов
+        order = sorted(_bits(fixed), key=lambda bit: zeros_count[bit] if cube[0] & bit else ones_count[bit],
+                       reverse=True)
+        # Разряды, по которым куб care (или off) противоречит исходному кубу; после вычеркивания
+        # разрядов raised он пересекает половину с другим значением переменной bit,
+        # только если все его противоречия - в raised или в самом bit
+        conflicts = [(full & ~((a & cube[0]) | (b & cube[1])), (a, b)) for a, b in (care if off is None else off)]
+        near = _near(conflicts, 0)
+        raised = failed = 0
+        for bit in order:
+            if off is not None:
+                allowed = bit not in near
+            else:
+                # Куб уже внутри care, проверяется только добавляемая половина с другим значением переменной
+                flipped = (cube[0] ^ bit, cube[1] ^ bit)
+                allowed = tautology(_cofactor(near.get(0, []) + near.get(bit, []), flipped, full), full)
+            if allowed:
+                cube = (cube[0] | bit, cube[1] | bit)
+                raised |= bit
+                # Невычеркнутая переменная не вычеркнется и позже: противоречащие по ней кубы не нужны
+                conflicts = [item for item in conflicts if not item[0] & failed]
+                near = _near(conflicts, raised)
+            else:
+                failed |= bit
+        # Куб стал простым: ранее расширенные кубы он может только повторять, а не поглощать
+        result[cube] = None
+        covered |= _contained(index, cube, full)
+    return list(result)
+
+
+def _irredundant(cover, dc_set, full):
+    """Удаление кубов, покрытых остальными кубами и безразличными наборами"""
+    cover = list(cover)
+    index = _literal_index(cover, full)
+    alive = (1 << len(cover)) - 1
+    for i in sorted(range(len(cover)), key=lambda i: bin(cover[i][0] & cover[i][1]).count('1')):
+        cube = cover[i]
+        others = list(_members(alive & ~(1 << i) & _intersecting(index, cube, full), cover)) + dc_set
+        if tautology(_cofactor(others, cube, full), full):
+            alive &= ~(1 << i)
+    return list(_members(alive, cover))
+
+
+def _complement_supercube(cover, full):
+    """Наименьший куб, содержащий дополнение покрытия; None, если дополнение пусто.
+
+    Дополнение целиком не строится: по Шеннону объединяются только
+    наименьшие кубы ветвей, а для унатного покрытия куб находится сразу.
+    """
+    if not cover:
+        return full, full
+    if (full, full) in cover:
+        return None
+    bit, binate = _split_variable(cover, full)
+    if not binate:
+        # Унатное покрытие: дополнению принадлежит набор, нарушающий все литералы,
+        # а противоположное значение переменной запрещает только куб из одного литерала
+        ones = zeros = full
+        for c in cover:
+            fixed = full & ~(c[0] & c[1])
+            if not fixed & (fixed - 1):
+                ones &= ~(fixed & c[0])
+                zeros &= ~(fixed & c[1])
+        return ones, zeros
+    high_cover = _literal_cofactor(cover, bit, 1)
+    low_cover = _literal_cofactor(cover, bit, 0)
+    high = _complement_supercube(high_cover, full)
+    # Если одна ветвь уже дала универсальный куб, от второй важна только пустота
+    if high == (full, full):
+        return high if not tautology(low_cover, full) else (full, full & ~bit)
+    low = _complement_supercube(low_cover, full)
+    if high is None:
+        return None if low is None else (low[0] & ~bit, low[1])
+    if low is None:
+        return high[0], high[1] & ~bit
+    return high[0] | low[0], high[1] | low[1]
+
+
+def _reduce(cover, dc_set, n, full):
+    """Сжатие каждого куба до наименьшего, покрывающего только его собственные наборы"""
+    result = sorted(cover, key=lambda c: _literals(c, n))
+    # Индекс строится по исходным кубам: сжатый куб пересекает не больше кубов, чем исходный
+    index = _literal_index(result, full)
+    alive = (1 << len(result)) - 1
+    for i, cube in enumerate(result):
+        others = list(_members(alive & ~(1 << i) & _intersecting(index, cube, full), result)) + dc_set
+        supercube = _complement_supercube(_cofactor(others, cube, full), full)
+        if supercube is None:
+            alive &= ~(1 << i)
+        else:
+            result[i] = (cube[0] & supercube[0], cube[1] & supercube[1])
+    return list(_members(alive, result))
+
+
+def _cost(cover, n):
+    return len(cover), sum(_literals(c, n) for c in cover)
+
+
+def espresso(on_set, dc_set=(), n=None, off_set=None):
+    """Минимизация ДНФ по ON-множеству и множеству безразличных наборов.
+
+    on_set и dc_set - последовательности кубов (значение, маска) от n
+    переменных. OFF-множество не строится: куб расширяется, пока кофактор
+    ON- и DC-множеств по нему остаётся тавтологией. Если покрытие
+    OFF-множества уже известно и невелико, его можно передать в off_set:
+    тогда расширение проверяет только пересечения с ним. Возвращает
+    неизбыточное покрытие из простых кубов; цикл REDUCE / EXPAND /
+    IRREDUNDANT повторяется, пока уменьшается число кубов и литералов.
+    """
+    if n is None:
+        raise ValueError("Нужно указать число переменных")
+    full = (1 << n) - 1
+    on = [to_positional(c, full) for c in on_set]
+    dc = [to_positional(c, full) for c in dc_set]
+    off = None if off_set is None else [to_positional(c, full) for c in off_set]
+    if not on:
+        return []
+    care = on + dc
+    cover = _irredundant(_expand(on, care, n, full, off), dc, full)
+    while True:
+        candidate = _irredundant(_expand(_reduce(cover, dc, n, full), care, n, full, off), dc, full)
+        if _cost(candidate, n) >= _cost(cover, n):
+            break
+        cover = candidate
+    return sorted((from_positional(c) for c in cover), key=lambda c: (-c[1], c[0]))
+
+
+def cubes_from_strings(rows):
+    """Кубы из строк вида '10-1' ('-' или 'X' - вычеркнутая переменная) и их число переменных"""
+    rows = list(rows)
+    n = len(rows[0]) if rows else 0
+    cubes = []
+    for row in rows:
+        if len(row) != n or not set(row) <= set('01-X'):
+            raise ValueError(f"Неверный куб: {row}")
+        value = int(row.replace('-', '0').replace('X', '0'), 2) if n else 0
+        mask = int(''.join('1' if c in '-X' else '0' for c in row), 2) if n else 0
+        cubes.append((value, mask))
+    return cubes, n
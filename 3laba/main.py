@@ -14,4 +14,8 @@ if __name__ == "__main__":
     result_carno_sdnf = tt.minimize_dnf_karnaugh()
     print("\nРезультат минимизации СДНФ:", result_calc_sdnf)
     result_carno_scnf = tt.minimize_cnf_karnaugh()
-    print("\nРезультат минимизации СКНФ:", result_calc_scnf)
\ No newline at end of file
+    print("\nРезультат минимизации СКНФ:", result_calc_scnf)
+    result_espresso_sdnf = tt.minimize_dnf_espresso()
+    print("\nРезультат минимизации СДНФ:", result_espresso_sdnf)
+    result_espresso_scnf = tt.minimize_cnf_espresso()
+    print("\nРезультат минимизации СКНФ:", result_espresso_scnf)
\ No newline at end of file
@@ -1,20 +1,17 @@
+import os
+import sys
 from typing import List
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'common'))
+from bitvector import BitVector
+
+
 class Binary_helper:
     @staticmethod
     def sum_b(first: List[int], second: List[int]) -> List[int]:
-        res = [0] * len(first)
-        add = 0
-        for i in range(len(res) - 1, -1, -1):
-            s = first[i] + second[i] + add
-            res[i] = s % 2
-            add = s // 2
-        return res
+        res, _ = BitVector.from_bits(first).add(BitVector.from_bits(second))
+        return res.to_list()
 
     @staticmethod
     def calculate(bin: List[int]) -> int:
-        res = 0
-        for i in range(len(bin)):
-            res *= 2
-            res += bin[i]
-        return res
\ No newline at end of file
+        return int(BitVector.from_bits(bin))
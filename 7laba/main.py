@@ -1,3 +1,11 @@
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'common'))
+
+from bitvector import BitVector
+
+
 def print_matrix(matrix, title="Исходная матрица"):
     """Печать матрицы"""
     print(f"{title}:")
@@ -96,25 +104,11 @@ def extract_fields(word):
 
 def binary_add(a_bits, b_bits):
     """Сложение двух двоичных чисел, представленных списками битов"""
-    # Преобразуем в числа
-    a = 0
-    b = 0
-
-    for i, bit in enumerate(reversed(a_bits)):
-        a += bit * (2 ** i)
-
-    for i, bit in enumerate(reversed(b_bits)):
-        b += bit * (2 ** i)
-
-    # Складываем
-    result = a + b
-
-    # Преобразуем обратно в биты (5 бит для результата)
-    result_bits = []
-    for i in range(5):
-        result_bits.insert(0, (result >> i) & 1)
-
-    return result_bits
+    # Оба слагаемых расширяются до 5 бит результата, перенос из старшего разряда отбрасывается
+    a = BitVector(int(BitVector.from_bits(a_bits)), 5)
+    b = BitVector(int(BitVector.from_bits(b_bits)), 5)
+    result, _ = a.add(b)
+    return result.to_list()
 
 
 def find_matching_words(matrix, target_v):
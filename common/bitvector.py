@@ -0,0 +1,115 @@
+class BitVector:
+    """Компактный битовый вектор фиксированной длины на основе целого Python.
+
+    Индексация как у списков битов в лабораторных: элемент 0 - старший бит.
+    """
+
+    __slots__ = ('_value', '_length')
+
+    def __init__(self, value=0, length=0):
+        if length < 0:
+            raise ValueError("Длина вектора не может быть отрицательной")
+        self._length = length
+        self._value = value & ((1 << length) - 1)
+
+    @classmethod
+    def from_bits(cls, bits):
+        """Список (или другая последовательность) 0/1 или bool, старший бит первым"""
+        value = length = 0
+        for bit in bits:
+            if bit not in (0, 1):
+                raise ValueError(f"Недопустимый бит: {bit!r}")
+            value = value << 1 | int(bit)
+            length += 1
+        return cls(value, length)
+
+    @classmethod
+    def from_string(cls, text):
+        return cls(int(text, 2) if text else 0, len(text))
+
+    def to_list(self):
+        return [int(c) for c in str(self)]
+
+    def __str__(self):
+        return format(self._value, f'0{self._length}b') if self._length else ''
+
+    def __repr__(self):
+        return f"BitVector('{self}')"
+
+    def __len__(self):
+        return self._length
+
+    def __int__(self):
+        return self._value
+
+    def __index__(self):
+        return self._value
+
+    def __iter__(self):
+        for i in range(self._length - 1, -1, -1):
+            yield (self._value >> i) & 1
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self._length)
+            if step != 1:
+                return BitVector.from_bits([self[i] for i in range(start, stop, step)])
+            width = max(stop - start, 0)
+            return BitVector(self._value >> (self._length - start - width), width)
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("Индекс вне вектора")
+        return (self._value >> (self._length - 1 - index)) & 1
+
+    def __eq__(self, other):
+        if isinstance(other, BitVector):
+            return self._length == other._length and self._value == other._value
+        if isinstance(other, list):
+            return self.to_list() == other
+        return NotImplemented
+
+    def __hash__(self):
+        return hash((self._value, self._length))
+
+    def __add__(self, other):
+        """Конкатенация, как у списков"""
+        return BitVector((self._value << other._length) | other._value, self._length + other._length)
+
+    def _same_length(self, other):
+        if self._length != other._length:
+            raise ValueError("Векторы должны быть одной длины")
+
+    def __and__(self, other):
+        self._same_length(other)
+        return BitVector(self._value & other._value, self._length)
+
+    def __or__(self, other):
+        self._same_length(other)
+        return BitVector(self._value | other._value, self._length)
+
+    def __xor__(self, other):
+        self._same_length(other)
+        return BitVector(self._value ^ other._value, self._length)
+
+    def __invert__(self):
+        return BitVector(~self._value, self._length)
+
+    def add(self, other, carry=0):
+        """Сложение с переносом. Возвращает (сумма той же длины, выходной перенос)"""
+        self._same_length(other)
+        total = self._value + other._value + carry
+        return BitVector(total, self._length), total >> self._length
+
+    def popcount(self):
+        return self._value.bit_count()
+
+    def rotate_left(self, shift):
+        if not self._length:
+            return self
+        shift %= self._length
+        value = (self._value << shift) | (self._value >> (self._length - shift))
+        return BitVector(value, self._length)
+
+    def rotate_right(self, shift):
+        return self.rotate_left(-shift)
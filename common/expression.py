@@ -0,0 +1,171 @@
+import re
+
+TOKEN_PATTERN = re.compile(r'\s*(?:(?P<name>[A-Za-z_][A-Za-z0-9_]*)|(?P<op>->|[&|!~()]))\s*')
+KEYWORDS = {'and': '&', 'or': '|', 'not': '!'}
+# Оператор: (приоритет, правоассоциативный)
+BINARY_OPERATORS = {
+    '~': (1, False),
+    '->': (2, True),
+    '|': (3, False),
+    '&': (4, False),
+}
+NOT_POWER = 5
+
+
+def normalize(expr):
+    return expr.strip().replace("&&", "&").replace("||", "|")
+
+
+def tokenize(expr):
+    """Разбиение выражения на лексемы (вид, значение, позиция) за один проход"""
+    tokens = []
+    pos = 0
+    while pos < len(expr):
+        match = TOKEN_PATTERN.match(expr, pos)
+        if match is None:
+            raise ValueError(f"Недопустимый символ '{expr[pos]}' в позиции {pos}")
+        pos = match.end()
+        if match.group('name'):
+            name = match.group('name')
+            if name in KEYWORDS:
+                tokens.append(('op', KEYWORDS[name], match.start('name')))
+            else:
+                tokens.append(('name', name, match.start('name')))
+        elif match.group('op'):
+            tokens.append(('op', match.group('op'), match.start('op')))
+    return tokens
+
+
+def extract_variables(expr):
+    """Все уникальные переменные выражения, без ключевых слов и операторов"""
+    return {value for kind, value, _ in tokenize(expr) if kind == 'name'}
+
+
+def parse(expr, nodes=None):
+    """Разбор выражения методом подъёма по приоритетам.
+
+    Узлы - кортежи (оператор, потомки...), переменные - строки. Если передан
+    словарь nodes, на каждое различное подвыражение создаётся единственный
+    экземпляр узла (hash-consing): потомки уже уникальны, поэтому ключом
+    служат их id, и дерево превращается в ациклический граф. В nodes
+    остаются все узлы и имена переменных. Разбор идёт на явных стеках
+    операторов и операндов, поэтому глубина вложенности не ограничена.
+    """
+    def node(op, *children):
+        if nodes is None:
+            return (op,) + children
+        key = (op,) + tuple(map(id, children))
+        found = nodes.get(key)
+        if found is None:
+            found = nodes[key] = (op,) + children
+        return found
+
+    def power(op):
+        return NOT_POWER if op == '!' else BINARY_OPERATORS[op][0]
+
+    def reduce():
+        op, _ = operators.pop()
+        if op == '!':
+            operands.append(node('!', operands.pop()))
+        else:
+            right = operands.pop()
+            operands.append(node(op, operands.pop(), right))
+
+    tokens = tokenize(expr)
+    operands = []
+    # Оператор или открывающая скобка с позицией в выражении
+    operators = []
+    open_brackets = 0
+    expect_operand = True
+    for kind, value, at in tokens:
+        if expect_operand:
+            if kind == 'name':
+                operands.append(value if nodes is None else nodes.setdefault(value, value))
+                expect_operand = False
+            elif value in ('!', '('):
+                operators.append((value, at))
+                open_brackets += value == '('
+            else:
+                raise ValueError(f"Ожидался операнд, а не '{value}' в позиции {at}")
+        elif kind == 'op' and value in BINARY_OPERATORS:
+            op_power, right_assoc = BINARY_OPERATORS[value]
+            # Сворачиваются операторы сильнее нового, при равенстве - только левоассоциативные
+            while operators and operators[-1][0] != '(' and (
+                    power(operators[-1][0]) > op_power or
+                    power(operators[-1][0]) == op_power and not right_assoc):
+                reduce()
+            operators.append((value, at))
+            expect_operand = True
+        elif value == ')' and open_brackets:
+            while operators[-1][0] != '(':
+                reduce()
+            operators.pop()
+            open_brackets -= 1
+        elif open_brackets:
+            bracket = next(pos for op, pos in reversed(operators) if op == '(')
+            raise ValueError(f"Не закрыта скобка из позиции {bracket}")
+        else:
+            raise ValueError(f"Лишний символ '{value}' в позиции {at}")
+    if expect_operand:
+        end = tokens[-1][2] + len(tokens[-1][1]) if tokens else 0
+        raise ValueError(f"Ожидался операнд в позиции {end}")
+    while operators:
+        if operators[-1][0] == '(':
+            raise ValueError(f"Не закрыта скобка из позиции {operators[-1][1]}")
+        reduce()
+    return operands[0]
+
+
+def emit(parsed, names, lines):
+    """Генерация присваиваний для узла и его потомков; возвращает имя результата.
+
+    Обход итеративный, поэтому длинные цепочки операций не упираются в
+    предел рекурсии. Каждый общий узел вычисляется один раз.
+    """
+    def name_of(node):
+        return names[node] if isinstance(node, str) else names.get(id(node))
+
+    stack = [parsed]
+    while stack:
+        node = stack[-1]
+        if name_of(node) is not None:
+            stack.pop()
+            continue
+        pending = [child for child in node[1:] if name_of(child) is None]
+        if pending:
+            stack.extend(pending)
+            continue
+        stack.pop()
+        operands = [name_of(child) for child in node[1:]]
+        if node[0] == '!':
+            code = f"_m ^ {operands[0]}"
+        elif node[0] == '&':
+            code = f"{operands[0]} & {operands[1]}"
+        elif node[0] == '|':
+            code = f"{operands[0]} | {operands[1]}"
+        elif node[0] == '->':
+            code = f"(_m ^ {operands[0]}) | {operands[1]}"
+        elif node[0] == '~':
+            code = f"_m ^ {operands[0]} ^ {operands[1]}"
+        else:
+            raise ValueError(f"Неизвестный оператор: {node[0]}")
+        names[id(node)] = f"t{len(lines)}"
+        lines.append(f"    {names[id(node)]} = {code}")
+    return name_of(parsed)
+
+
+def compile_expression(parsed, variables):
+    """Компиляция разобранного выражения в функцию Python f(x0, ..., xn-1, _m=True).
+
+    Аргументы - значения переменных в порядке variables. Операции
+    побитовые, поэтому функция работает и с bool, и с целыми-столбцами,
+    если передать _m - маску из единиц нужной ширины.
+    """
+    names = {var: f"x{i}" for i, var in enumerate(variables)}
+    args = ", ".join(list(names.values()) + ["_m=True"])
+    lines = []
+    result = emit(parsed, names, lines)
+    source = "\n".join([f"def _compiled({args}):"] + lines + [f"    return {result}", ""])
+    namespace = {}
+    exec(compile(source, "<truthtable>", "exec"), namespace)
+    return namespace["_compiled"]
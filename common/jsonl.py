@@ -0,0 +1,34 @@
+import json
+import math
+
+# Сколько JSON-записей накапливается перед одной записью в выходной поток
+FLUSH_RECORDS = 4096
+
+
+def _finite(value):
+    """Замена inf и nan, недопустимых в JSON, строками 'inf', '-inf', 'nan'"""
+    if isinstance(value, float) and not math.isfinite(value):
+        return repr(value)
+    if isinstance(value, dict):
+        return {key: _finite(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_finite(item) for item in value]
+    return value
+
+
+def write_jsonl(records, out):
+    """Запись словарей в поток по одному JSON на строку, пачками по FLUSH_RECORDS"""
+    buffer = []
+    for record in records:
+        try:
+            line = json.dumps(record, ensure_ascii=False, allow_nan=False)
+        except ValueError:
+            line = json.dumps(_finite(record), ensure_ascii=False, allow_nan=False)
+        buffer.append(line)
+        if len(buffer) >= FLUSH_RECORDS:
+            buffer.append('')
+            out.write('\n'.join(buffer))
+            buffer.clear()
+    if buffer:
+        buffer.append('')
+        out.write('\n'.join(buffer))
@@ -0,0 +1,118 @@
+import os
+import sys
+import unittest
+from io import StringIO
+from unittest.mock import patch
+
+import jsonl
+from bitvector import BitVector
+from expression import compile_expression, extract_variables, normalize, parse
+from jsonl import write_jsonl
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '4laba'))
+
+from Binary_helper import Binary_helper
+
+
+class TestBitVector(unittest.TestCase):
+    def test_conversions(self):
+        v = BitVector.from_bits([1, 0, 1, 1, 0])
+        self.assertEqual(str(v), '10110')
+        self.assertEqual(int(v), 22)
+        self.assertEqual(v.to_list(), [1, 0, 1, 1, 0])
+        self.assertEqual(BitVector.from_string('0011'), BitVector(3, 4))
+        self.assertEqual(len(BitVector.from_bits([])), 0)
+
+    def test_from_bool_bits(self):
+        self.assertEqual(BitVector.from_bits([True, False, True]), BitVector(5, 3))
+        self.assertEqual(Binary_helper.sum_b([True, False, True], [False, False, True]), [1, 1, 0])
+        for bits in ([0, 2], [1, '1'], [0.5]):
+            with self.assertRaises(ValueError):
+                BitVector.from_bits(bits)
+
+    def test_indexing_and_slicing(self):
+        v = BitVector.from_string('10110')
+        self.assertEqual((v[0], v[1], v[-1]), (1, 0, 0))
+        self.assertEqual(str(v[1:4]), '011')
+        self.assertEqual(str(v[::2]), '110')
+        self.assertEqual(list(v), [1, 0, 1, 1, 0])
+        with self.assertRaises(IndexError):
+            v[5]
+
+    def test_concatenation_and_bitwise(self):
+        a, b = BitVector.from_string('1100'), BitVector.from_string('1010')
+        self.assertEqual(str(a + b), '11001010')
+        self.assertEqual(str(a & b), '1000')
+        self.assertEqual(str(a | b), '1110')
+        self.assertEqual(str(a ^ b), '0110')
+        self.assertEqual(str(~a), '0011')
+        with self.assertRaises(ValueError):
+            a & BitVector(1, 3)
+
+    def test_add_with_carry(self):
+        a, b = BitVector.from_string('1111'), BitVector.from_string('0001')
+        self.assertEqual(a.add(b), (BitVector(0, 4), 1))
+        self.assertEqual(BitVector(3, 4).add(BitVector(5, 4), carry=1), (BitVector(9, 4), 0))
+
+    def test_popcount_and_rotate(self):
+        v = BitVector.from_string('10110')
+        self.assertEqual(v.popcount(), 3)
+        self.assertEqual(str(v.rotate_left(1)), '01101')
+        self.assertEqual(str(v.rotate_right(1)), '01011')
+        self.assertEqual(v.rotate_left(5), v)
+
+    def test_equality_with_lists(self):
+        self.assertEqual(BitVector(5, 3), [1, 0, 1])
+        self.assertEqual(len({BitVector(5, 3), BitVector(5, 3), BitVector(5, 4)}), 2)
+
+
+
+class TestExpression(unittest.TestCase):
+    def test_parse(self):
+        self.assertEqual(normalize(" a && b || c "), "a & b | c")
+        self.assertEqual(extract_variables("x1 and not y or x1"), {"x1", "y"})
+        self.assertEqual(parse("a | b & !c -> d"), ('->', ('|', 'a', ('&', 'b', ('!', 'c'))), 'd'))
+        with self.assertRaises(ValueError):
+            parse("a & (b | c")
+
+    def test_deep_nesting(self):
+        tree = parse("!" * 3000 + "a")
+        for _ in range(3000):
+            self.assertEqual(tree[0], '!')
+            tree = tree[1]
+        self.assertEqual(tree, 'a')
+        self.assertEqual(parse("(" * 1200 + "a & b" + ")" * 1200), ('&', 'a', 'b'))
+        chain = parse("&(".join(f"x{i}" for i in range(300)) + ")" * 299)
+        self.assertEqual(chain[:2], ('&', 'x0'))
+        self.assertEqual(chain[2][:2], ('&', 'x1'))
+
+    def test_shared_nodes(self):
+        nodes = {}
+        tree = parse("(a & b) | (a & b)", nodes)
+        self.assertIs(tree[1], tree[2])
+        self.assertEqual(len(nodes), 4)
+
+    def test_compile_long_chain(self):
+        """Плоские присваивания: цепочка из 1600 операций не упирается в рекурсию"""
+        function = compile_expression(parse("&".join(["a", "b"] * 800)), ["a", "b"])
+        self.assertEqual([function(a, b) for a in (False, True) for b in (False, True)],
+                         [False, False, False, True])
+        self.assertEqual(function(0b1100, 0b1010, _m=0b1111), 0b1000)
+
+class TestJsonl(unittest.TestCase):
+    def test_write_jsonl(self):
+        out = StringIO()
+        records = [{"line": 1, "value": float('inf')}, {"line": 2, "values": [float('nan'), -float('inf')]}]
+        write_jsonl(records, out)
+        self.assertEqual(out.getvalue(),
+                         '{"line": 1, "value": "inf"}\n{"line": 2, "values": ["nan", "-inf"]}\n')
+
+    def test_flush_in_batches(self):
+        out = StringIO()
+        with patch.object(jsonl, 'FLUSH_RECORDS', 2):
+            write_jsonl(({"line": i} for i in range(5)), out)
+        self.assertEqual(out.getvalue().splitlines(), [f'{{"line": {i}}}' for i in range(5)])
+
+
+if __name__ == '__main__':
+    unittest.main()